@@ -56,8 +56,8 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 import numpy as np
-import yfinance as yf
-from utils import output_json, safe_run, calculate_sma, max_constructive_depth_pct
+from numpy.lib.stride_tricks import sliding_window_view
+from utils import output_json, safe_run, calculate_sma, fetch_history, max_constructive_depth_pct
 
 # ── Constants ──────────────────────────────────────────────────────────
 # A new base's high need only EXCEED the prior breakout (a higher step in the
@@ -80,19 +80,20 @@ REL_CORRECTION_NORMAL_RATIO = 2.0    # <=2x SPY's drop = normal
 REL_CORRECTION_ELEVATED_RATIO = 3.0  # <=3x = elevated; above = excessive
 
 
-def _is_swing_high(highs_arr, idx, window=SWING_HIGH_WINDOW):
-	"""Check if idx is a swing high within a symmetric window.
+def _swing_high_mask(highs_arr, window=SWING_HIGH_WINDOW):
+	"""Boolean mask of the bars that are swing highs within a symmetric window.
 
 	A swing high is the highest point in a window of 2*window days
-	centered on idx. This filters out minor peaks.
+	centered on the bar (clipped at the series edges). This filters out
+	minor peaks. Every bar's window max comes from one strided reduction.
 	"""
-	start = max(0, idx - window)
-	end = min(len(highs_arr), idx + window + 1)
+	n = len(highs_arr)
+	pad = np.full(window, -np.inf)
+	window_max = sliding_window_view(np.concatenate((pad, highs_arr, pad)), 2 * window + 1).max(axis=1)
 
-	if end - start < window:  # Not enough data
-		return False
-
-	return highs_arr[idx] == np.max(highs_arr[start:end])
+	idx = np.arange(n)
+	span = np.minimum(n, idx + window + 1) - np.maximum(0, idx - window)
+	return (highs_arr == window_max) & (span >= window)  # short clipped windows: not enough data
 
 
 def _find_bases(closes, highs, lows, sma200, min_base_weeks=3,
@@ -116,23 +117,25 @@ def _find_bases(closes, highs, lows, sma200, min_base_weeks=3,
 	sma200_arr = sma200.values.astype(float)
 	dates = closes.index
 	n = len(closes_arr)
+	swing_high = _swing_high_mask(highs_arr, swing_window)
 
 	min_base_days = min_base_weeks * 5
 	completed_bases = []
 	forming_base = None
 	last_breakout_price = 0.0
 
+	# A base can only open on a swing high above the 200MA (Stage 2); screen every
+	# bar for both at once and jump the scan straight to the next such bar.
+	base_starts = np.flatnonzero(~(np.isnan(sma200_arr) | (closes_arr < sma200_arr)) & swing_high)
+
 	i = 0
 	while i < n - min_base_days:
-		# Must be above 200MA (Stage 2)
-		if np.isnan(sma200_arr[i]) or closes_arr[i] < sma200_arr[i]:
-			i += 1
-			continue
-
-		# Check for swing high
-		if not _is_swing_high(highs_arr, i, swing_window):
-			i += 1
-			continue
+		next_start = int(np.searchsorted(base_starts, i))
+		if next_start == len(base_starts):
+			break
+		i = int(base_starts[next_start])
+		if i >= n - min_base_days:
+			break
 
 		base_high = highs_arr[i]
 		base_start_idx = i
@@ -284,14 +287,20 @@ def _check_base_reset(closes, sma200, reset_window=RESET_WINDOW, reset_threshold
 	return reset_points
 
 
-def _compute_relative_correction(dates, start_idx, end_idx, stock_correction_pct):
-	"""Compute stock correction depth relative to SPY during the same period."""
+def _compute_relative_correction(spy_history, spy_days, dates, start_idx, end_idx, stock_correction_pct):
+	"""Compute stock correction depth relative to SPY during the same period.
+
+	`spy_history` is SPY over the whole analysis period, fetched once per run,
+	and `spy_days` its index formatted once as YYYY-MM-DD. The dates are in
+	order, so each base finds its own [start, end) window by binary search.
+	"""
+	if spy_history is None:
+		return None, "unknown"
 	start_date = str(dates[start_idx].date())
 	end_date = str(dates[end_idx].date())
 
 	try:
-		spy = yf.Ticker("SPY")
-		spy_data = spy.history(start=start_date, end=end_date, interval="1d")
+		spy_data = spy_history.iloc[spy_days.searchsorted(start_date) : spy_days.searchsorted(end_date)]
 		if spy_data.empty or len(spy_data) < 5:
 			return None, "unknown"
 
@@ -350,8 +359,7 @@ def _compute_cross_base_analysis(bases):
 def cmd_count(args):
 	"""Count bases and assess current base stage."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
 
 	if data.empty or len(data) < 200:
@@ -389,8 +397,17 @@ def cmd_count(args):
 		# and forming base started before, discard it
 		pass  # forming_base is always recent by construction
 
-	# Number bases, classify, compute relative correction
+	# Number bases, classify, compute relative correction. SPY is pulled once for
+	# the whole period and sliced per base, not re-downloaded for every base.
 	dates = closes.index
+	spy_history = None
+	spy_days = None
+	if all_bases:
+		try:
+			spy_history = fetch_history("SPY", period=args.period, interval="1d")
+			spy_days = spy_history.index.strftime("%Y-%m-%d")
+		except Exception:
+			spy_history = None
 	for i, base in enumerate(all_bases):
 		base["base_number"] = i + 1
 		base["pattern_type"] = _classify_base_pattern(
@@ -398,7 +415,7 @@ def cmd_count(args):
 			base["duration_weeks"],
 		)
 		ratio, severity = _compute_relative_correction(
-			dates, base["start_idx"], base["end_idx"], base["correction_depth_pct"]
+			spy_history, spy_days, dates, base["start_idx"], base["end_idx"], base["correction_depth_pct"]
 		)
 		base["relative_correction_ratio"] = ratio
 		base["correction_severity"] = severity
@@ -702,6 +702,12 @@ def _enrich_post_er_reactions(ticker, surprises, drift_days=(1, 5)):
 	if hist.index.tz is not None:
 		hist.index = hist.index.tz_localize(None)
 
+	# Each earnings date is located with one binary search on the (sorted) index;
+	# the bars after it are then plain positional reads off the price arrays.
+	hist_dates = hist.index
+	open_arr = hist["Open"].to_numpy(dtype=float)
+	close_arr = hist["Close"].to_numpy(dtype=float)
+
 	for i, s in enumerate(surprises):
 		er_dt = er_dates[i]
 		if er_dt is None:
@@ -712,35 +718,31 @@ def _enrich_post_er_reactions(ticker, surprises, drift_days=(1, 5)):
 			er_dt_norm = pd.Timestamp(er_dt).normalize()
 
 			# Find pre-ER close: last trading day on or before earnings date
-			mask_on_or_before = hist.index <= er_dt_norm
-			if not mask_on_or_before.any():
+			after_pos = int(hist_dates.searchsorted(er_dt_norm, side="right"))
+			if after_pos == 0:
 				_null_out(s)
 				continue
 
-			pre_er_idx = hist.index[mask_on_or_before][-1]
-			pre_er_close = float(hist.loc[pre_er_idx, "Close"])
+			pre_er_close = float(close_arr[after_pos - 1])
 
 			if pre_er_close <= 0:
 				_null_out(s)
 				continue
 
 			# Trading days after earnings date
-			mask_after = hist.index > er_dt_norm
-			days_after = hist.index[mask_after]
+			days_after = len(hist_dates) - after_pos
 
 			# post_er_gap: next trading day open vs pre-ER close
-			if len(days_after) >= 1:
-				next_day = days_after[0]
-				next_open = float(hist.loc[next_day, "Open"])
+			if days_after >= 1:
+				next_open = float(open_arr[after_pos])
 				s["post_er_gap"] = round((next_open / pre_er_close - 1) * 100, 2)
 			else:
 				s["post_er_gap"] = None
 
 			# post_er_return_{n}d: n-th trading-day close vs pre-ER close, per horizon
 			for n, key in zip(drift_days, return_keys):
-				if len(days_after) >= n:
-					day_n = days_after[n - 1]
-					day_n_close = float(hist.loc[day_n, "Close"])
+				if days_after >= n:
+					day_n_close = float(close_arr[after_pos + n - 1])
 					s[key] = round((day_n_close / pre_er_close - 1) * 100, 2)
 				else:
 					s[key] = None
@@ -14,6 +14,8 @@ Commands:
 Args:
 	symbol (str): Ticker symbol (e.g., "AAPL", "NVDA", "META")
 	symbols (str): Space-separated ticker symbols for screen command
+	--jsonl (flag): screen only — stream one compact JSON line per symbol (NDJSON)
+		as it is scanned, in input order and unranked, instead of one ranked document
 
 Returns:
 	For scan:
@@ -44,12 +46,17 @@ Returns:
 				"pattern_count": int,
 				"best_pattern": str,
 				"best_quality": str,
-				"setup_readiness": str
+				"setup_readiness": str,
+				"error": str  # only when the symbol's scan failed
 			}
 		],
 		"ranked_by": "pattern_count"
 	}
 
+	For screen --jsonl (one line per symbol, no "results"/"ranked_by" wrapper):
+	{"symbol": str, "pattern_count": int, "best_pattern": str, "best_quality": str,
+	 "setup_readiness": str, "error": str (only when the scan failed)}
+
 Example:
 	>>> python entry_patterns.py scan NVDA
 	{
@@ -70,6 +77,10 @@ Example:
 		"setup_readiness": {"classification": "actionable", "thresholds": {...}}
 	}
 
+	>>> python entry_patterns.py screen NVDA AMD --jsonl
+	{"symbol":"NVDA","pattern_count":1,"best_pattern":"MA_PULLBACK","best_quality":"high","setup_readiness":"actionable"}
+	{"symbol":"AMD","pattern_count":0,"best_pattern":null,"best_quality":null,"setup_readiness":"none"}
+
 Use Cases:
 	- Identify low-risk pullback entries into leading stocks
 	- Detect consolidation pivot breakout setups
@@ -97,8 +108,8 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 import numpy as np
-import yfinance as yf
-from utils import output_json, safe_run
+from numpy.lib.stride_tricks import sliding_window_view
+from utils import fetch_history, fetch_history_batch, output_json, output_json_line, safe_run
 
 
 # --- Tunable context parameters (CLI-overridable, default to these constants) ---
@@ -134,7 +145,7 @@ def _stop_pct(entry_price, stop_price):
 	return round(abs(entry_price - stop_price) / entry_price * 100, 2)
 
 
-def _detect_ma_pullback(close_arr, vol_arr, pullback_vol_days=PULLBACK_VOL_DAYS):
+def _detect_ma_pullback(close_arr, vol_arr, avg_vol_50, pullback_vol_days=PULLBACK_VOL_DAYS):
 	"""Detect MA_PULLBACK pattern.
 
 	Ch.10: "pullbacks to key MAs with lower volume on pullbacks"
@@ -152,18 +163,19 @@ def _detect_ma_pullback(close_arr, vol_arr, pullback_vol_days=PULLBACK_VOL_DAYS)
 	# Calculate MAs
 	sma10 = np.mean(close_arr[-10:])
 	sma50 = np.mean(close_arr[-50:])
-	# EMA 21
-	ema21_arr = np.full(n, np.nan)
+	# EMA 21, seeded with the first 21-bar SMA. Only today's value is read, so the
+	# recurrence runs on plain floats with a scalar carry instead of filling an array.
+	ema21 = 0.0
 	if n >= 21:
-		ema21_arr[20] = np.mean(close_arr[:21])
+		ema21 = float(np.mean(close_arr[:21]))
 		mult = 2.0 / (21 + 1)
-		for i in range(21, n):
-			ema21_arr[i] = close_arr[i] * mult + ema21_arr[i - 1] * (1 - mult)
-	ema21 = float(ema21_arr[-1]) if not np.isnan(ema21_arr[-1]) else 0.0
+		for close in close_arr[21:].tolist():
+			ema21 = close * mult + ema21 * (1 - mult)
+		if ema21 != ema21:  # NaN close in the history
+			ema21 = 0.0
 
 	# Pullback volume: avg of last N days
 	pullback_vol = float(np.mean(vol_arr[-pullback_vol_days:]))
-	avg_vol_50 = float(np.mean(vol_arr[-50:]))
 	if avg_vol_50 <= 0:
 		return []
 	pullback_vol_ratio = round(pullback_vol / avg_vol_50, 2)
@@ -216,6 +228,7 @@ def _detect_consolidation_pivot(
 	high_arr,
 	low_arr,
 	vol_arr,
+	avg_vol_50,
 	pivot_min_days=PIVOT_MIN_DAYS,
 	pivot_max_days=PIVOT_MAX_DAYS,
 	pivot_range_max=PIVOT_RANGE_MAX,
@@ -237,58 +250,64 @@ def _detect_consolidation_pivot(
 	if n < 10:
 		return []
 
-	avg_vol_50 = float(np.mean(vol_arr[-50:])) if len(vol_arr) >= 50 else float(np.mean(vol_arr))
-
-	for window in range(min(pivot_max_days, n), pivot_min_days - 1, -1):
-		segment_high = high_arr[-window:]
-		segment_low = low_arr[-window:]
-
-		resistance = float(np.max(segment_high))
-		support = float(np.min(segment_low))
-
-		if support <= 0:
-			continue
-
-		range_pct = (resistance - support) / support * 100
-		if range_pct >= pivot_range_max:
-			continue
+	# Volume vacuum into the pivot: at least one of the last few days below the
+	# 50-day average. Without it, the range is churn, not a base completing.
+	# It reads only the last 5 bars, so it is the same for every candidate window.
+	recent_vol = vol_arr[-5:]
+	dry_up_days = int(np.sum(recent_vol < avg_vol_50)) if avg_vol_50 > 0 else 0
+	volume_dry_up = dry_up_days >= 1
+
+	# Every candidate window is a suffix ending at the last bar, so one running
+	# max/min taken backwards gives each window's resistance/support by lookup.
+	suffix_high = np.maximum.accumulate(high_arr[::-1])
+	suffix_low = np.minimum.accumulate(low_arr[::-1])
+
+	# The longest window that is tight enough wins: evaluate every candidate
+	# length at once and take the first (longest) one that passes.
+	windows = np.arange(min(pivot_max_days, n), pivot_min_days - 1, -1)
+	resistances = suffix_high[windows - 1]
+	supports = suffix_low[windows - 1]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		range_pcts = (resistances - supports) / supports * 100
+		passing = np.flatnonzero(~(supports <= 0) & ~(range_pcts >= pivot_range_max))
+
+	if passing.size == 0:
+		return []
 
-		# Volume vacuum into the pivot: at least one of the last few days below the
-		# 50-day average. Without it, the range is churn, not a base completing.
-		recent_vol = vol_arr[-5:]
-		dry_up_days = int(np.sum(recent_vol < avg_vol_50)) if avg_vol_50 > 0 else 0
-		volume_dry_up = dry_up_days >= 1
+	k = passing[0]
+	window = int(windows[k])
+	resistance = float(resistances[k])
+	support = float(supports[k])
+	range_pct = float(range_pcts[k])
 
-		pivot_price = round(resistance, 2)
-		trigger_price = round(resistance * 1.003, 2)
-		stop_price = round(support, 2)
+	pivot_price = round(resistance, 2)
+	trigger_price = round(resistance * 1.003, 2)
+	stop_price = round(support, 2)
 
-		# "high" needs a tight, mature range AND the volume vacuum — both, not either.
-		if range_pct < PIVOT_HIGH_RANGE_PCT and window >= PIVOT_HIGH_MIN_WINDOW and volume_dry_up:
-			quality = "high"
-		else:
-			quality = "moderate"
-
-		return [{
-			"pattern": "CONSOLIDATION_PIVOT",
-			"pivot_price": pivot_price,
-			"range_pct": round(range_pct, 2),
-			"range_pct_unit": "% price range over N days",
-			"days_in_range": window,
-			"volume_dry_up": volume_dry_up,
-			"dry_up_days_last5": dry_up_days,
-			"trigger_price": trigger_price,
-			"stop_price": stop_price,
-			"stop_pct": _stop_pct(trigger_price, stop_price),
-			"stop_pct_unit": "% risk from trigger to stop",
-			"quality": quality,
-		}]
-
-	return []
+	# "high" needs a tight, mature range AND the volume vacuum — both, not either.
+	if range_pct < PIVOT_HIGH_RANGE_PCT and window >= PIVOT_HIGH_MIN_WINDOW and volume_dry_up:
+		quality = "high"
+	else:
+		quality = "moderate"
+
+	return [{
+		"pattern": "CONSOLIDATION_PIVOT",
+		"pivot_price": pivot_price,
+		"range_pct": round(range_pct, 2),
+		"range_pct_unit": "% price range over N days",
+		"days_in_range": window,
+		"volume_dry_up": volume_dry_up,
+		"dry_up_days_last5": dry_up_days,
+		"trigger_price": trigger_price,
+		"stop_price": stop_price,
+		"stop_pct": _stop_pct(trigger_price, stop_price),
+		"stop_pct_unit": "% risk from trigger to stop",
+		"quality": quality,
+	}]
 
 
 def _detect_support_reclaim(
-	close_arr, low_arr, vol_arr, dates, undercut_lookback_days=UNDERCUT_LOOKBACK_DAYS
+	close_arr, low_arr, vol_arr, avg_vol_50, dates, undercut_lookback_days=UNDERCUT_LOOKBACK_DAYS
 ):
 	"""Detect SUPPORT_RECLAIM pattern.
 
@@ -300,7 +319,12 @@ def _detect_support_reclaim(
 	if n < 50:
 		return []
 
-	sma50_current = float(np.mean(close_arr[-50:]))
+	# Every 50 SMA the scan reads (today plus the lookback days) in one pass:
+	# sma50[k] is the mean of the 50 closes ending at bar sma50_start + 49 + k.
+	sma50_start = max(0, n - 50 - undercut_lookback_days)
+	sma50 = sliding_window_view(close_arr[sma50_start:], 50).mean(axis=1)
+
+	sma50_current = float(sma50[-1])
 	if sma50_current <= 0:
 		return []
 
@@ -308,45 +332,43 @@ def _detect_support_reclaim(
 	if close_arr[-1] <= sma50_current:
 		return []
 
-	# Check last N days for undercut (Low < 50 SMA * UNDERCUT_DEPTH_PCT)
-	for offset in range(1, undercut_lookback_days + 1):
-		idx = n - 1 - offset
-		if idx < 49:
-			break
-
-		sma50_at_idx = float(np.mean(close_arr[idx - 49 : idx + 1]))
-		if sma50_at_idx <= 0:
-			continue
-
-		if low_arr[idx] < sma50_at_idx * UNDERCUT_DEPTH_PCT:
-			undercut_pct = round((sma50_at_idx - low_arr[idx]) / sma50_at_idx * 100, 2)
+	# Check last N days for undercut (Low < 50 SMA * UNDERCUT_DEPTH_PCT): one mask
+	# over the lookback bars, most recent first, and the first hit is the undercut.
+	lookback_idx = np.arange(n - 2, max(n - 2 - undercut_lookback_days, 48), -1)
+	sma50_lookback = sma50[lookback_idx - 49 - sma50_start]
+	undercut_hits = np.flatnonzero(
+		(sma50_lookback > 0) & (low_arr[lookback_idx] < sma50_lookback * UNDERCUT_DEPTH_PCT)
+	)
+	if undercut_hits.size == 0:
+		return []
 
-			# Volume surge check: reclaim day volume vs 50d avg
-			avg_vol_50 = float(np.mean(vol_arr[-50:]))
-			reclaim_vol = float(vol_arr[-1])
-			vol_surge = reclaim_vol > avg_vol_50 * RECLAIM_VOL_SURGE if avg_vol_50 > 0 else False
+	idx = int(lookback_idx[undercut_hits[0]])
+	sma50_at_idx = float(sma50_lookback[undercut_hits[0]])
+	undercut_pct = round((sma50_at_idx - low_arr[idx]) / sma50_at_idx * 100, 2)
 
-			# Quality: "high" if volume surge on reclaim (Minervini: "rallies back on big volume")
-			quality = "high" if vol_surge else "moderate"
+	# Volume surge check: reclaim day volume vs 50d avg
+	reclaim_vol = float(vol_arr[-1])
+	vol_surge = reclaim_vol > avg_vol_50 * RECLAIM_VOL_SURGE if avg_vol_50 > 0 else False
 
-			trigger_price = round(sma50_current, 2)
-			stop_price = round(float(low_arr[idx]), 2)
+	# Quality: "high" if volume surge on reclaim (Minervini: "rallies back on big volume")
+	quality = "high" if vol_surge else "moderate"
 
-			return [{
-				"pattern": "SUPPORT_RECLAIM",
-				"support_level": round(sma50_current, 2),
-				"undercut_pct": undercut_pct,
-				"undercut_pct_unit": "% below 50 SMA",
-				"reclaim_date": str(dates[-1].date()),
-				"volume_surge_on_reclaim": vol_surge,
-				"trigger_price": trigger_price,
-				"stop_price": stop_price,
-				"stop_pct": _stop_pct(trigger_price, stop_price),
-				"stop_pct_unit": "% risk from trigger to stop",
-				"quality": quality,
-			}]
+	trigger_price = round(sma50_current, 2)
+	stop_price = round(float(low_arr[idx]), 2)
 
-	return []
+	return [{
+		"pattern": "SUPPORT_RECLAIM",
+		"support_level": round(sma50_current, 2),
+		"undercut_pct": undercut_pct,
+		"undercut_pct_unit": "% below 50 SMA",
+		"reclaim_date": str(dates[-1].date()),
+		"volume_surge_on_reclaim": vol_surge,
+		"trigger_price": trigger_price,
+		"stop_price": stop_price,
+		"stop_pct": _stop_pct(trigger_price, stop_price),
+		"stop_pct_unit": "% risk from trigger to stop",
+		"quality": quality,
+	}]
 
 
 def _determine_readiness(patterns):
@@ -377,10 +399,15 @@ def _scan_symbol(
 	pivot_max_days=PIVOT_MAX_DAYS,
 	undercut_lookback_days=UNDERCUT_LOOKBACK_DAYS,
 	pivot_range_max=PIVOT_RANGE_MAX,
+	data=None,
 ):
-	"""Core scan logic for a single symbol. Returns the result dict."""
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period="1y", interval="1d")
+	"""Core scan logic for a single symbol. Returns the result dict.
+
+	`data` takes a pre-fetched 1y daily history (screen batches the download);
+	when omitted the symbol is fetched on its own.
+	"""
+	if data is None:
+		data = fetch_history(symbol, period="1y", interval="1d")
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
 
 	if data.empty or len(data) < 50:
@@ -389,22 +416,24 @@ def _scan_symbol(
 			"data_points": len(data),
 		}
 
-	close_arr = data["Close"].values.astype(float)
-	high_arr = data["High"].values.astype(float)
-	low_arr = data["Low"].values.astype(float)
-	vol_arr = data["Volume"].values.astype(float)
+	close_arr = data["Close"].to_numpy(dtype=float)
+	high_arr = data["High"].to_numpy(dtype=float)
+	low_arr = data["Low"].to_numpy(dtype=float)
+	vol_arr = data["Volume"].to_numpy(dtype=float)
 	dates = data.index
+	# Every detector measures volume against the same 50-day average (data has >= 50 bars).
+	avg_vol_50 = float(np.mean(vol_arr[-50:]))
 
 	# Run detectors (Minervini-grounded patterns only)
 	active_patterns = []
-	active_patterns.extend(_detect_ma_pullback(close_arr, vol_arr, pullback_vol_days))
+	active_patterns.extend(_detect_ma_pullback(close_arr, vol_arr, avg_vol_50, pullback_vol_days))
 	active_patterns.extend(
 		_detect_consolidation_pivot(
-			high_arr, low_arr, vol_arr, pivot_min_days, pivot_max_days, pivot_range_max
+			high_arr, low_arr, vol_arr, avg_vol_50, pivot_min_days, pivot_max_days, pivot_range_max
 		)
 	)
 	active_patterns.extend(
-		_detect_support_reclaim(close_arr, low_arr, vol_arr, dates, undercut_lookback_days)
+		_detect_support_reclaim(close_arr, low_arr, vol_arr, avg_vol_50, dates, undercut_lookback_days)
 	)
 
 	return {
@@ -440,13 +469,9 @@ def cmd_scan(args):
 	output_json(result)
 
 
-@safe_run
-def cmd_screen(args):
-	"""Batch scan multiple stocks for entry patterns."""
-	symbols = [s.upper() for s in args.symbols]
-	results = []
-
-	for symbol in symbols:
+def _screen_row(symbol, data, args):
+	"""One symbol's screen summary row; a failed scan keeps its error in the row."""
+	try:
 		scan = _scan_symbol(
 			symbol,
 			pullback_vol_days=args.pullback_vol_days,
@@ -454,36 +479,58 @@ def cmd_screen(args):
 			pivot_max_days=args.pivot_max_days,
 			undercut_lookback_days=args.undercut_lookback_days,
 			pivot_range_max=args.pivot_range_max,
+			data=data,
 		)
+	except Exception as e:
+		scan = {"error": f"{type(e).__name__}: {e}"}
 
-		if "error" in scan:
-			results.append({
-				"symbol": symbol,
-				"pattern_count": 0,
-				"best_pattern": None,
-				"best_quality": None,
-				"setup_readiness": "none",
-			})
-			continue
+	if "error" in scan:
+		return {
+			"symbol": symbol,
+			"pattern_count": 0,
+			"best_pattern": None,
+			"best_quality": None,
+			"setup_readiness": "none",
+			"error": scan["error"],
+		}
 
-		best_pattern = None
-		best_quality = None
-		quality_rank = {"high": 2, "moderate": 1}
+	best_pattern = None
+	best_quality = None
+	quality_rank = {"high": 2, "moderate": 1}
 
-		for p in scan["active_patterns"]:
-			q = p["quality"]
-			if best_quality is None or quality_rank.get(q, 0) > quality_rank.get(best_quality, 0):
-				best_pattern = p["pattern"]
-				best_quality = q
+	for p in scan["active_patterns"]:
+		q = p["quality"]
+		if best_quality is None or quality_rank.get(q, 0) > quality_rank.get(best_quality, 0):
+			best_pattern = p["pattern"]
+			best_quality = q
 
-		sr = scan["setup_readiness"]
-		results.append({
-			"symbol": symbol,
-			"pattern_count": scan["pattern_count"],
-			"best_pattern": best_pattern,
-			"best_quality": best_quality,
-			"setup_readiness": sr["classification"] if isinstance(sr, dict) else sr,
-		})
+	sr = scan["setup_readiness"]
+	return {
+		"symbol": symbol,
+		"pattern_count": scan["pattern_count"],
+		"best_pattern": best_pattern,
+		"best_quality": best_quality,
+		"setup_readiness": sr["classification"] if isinstance(sr, dict) else sr,
+	}
+
+
+@safe_run
+def cmd_screen(args):
+	"""Batch scan multiple stocks for entry patterns."""
+	symbols = [s.upper() for s in args.symbols]
+	histories = fetch_history_batch(symbols, period="1y", interval="1d")
+	results = []
+
+	for symbol in symbols:
+		row = _screen_row(symbol, histories[symbol], args)
+		if args.jsonl:
+			# Ranking needs the full set, so in streaming mode it is the caller's.
+			output_json_line(row)
+		else:
+			results.append(row)
+
+	if args.jsonl:
+		return
 
 	results.sort(key=lambda r: r["pattern_count"], reverse=True)
 
@@ -545,6 +592,12 @@ def main():
 
 	sp = sub.add_parser("screen", help="Batch scan multiple stocks")
 	sp.add_argument("symbols", nargs="+", help="Ticker symbols")
+	sp.add_argument(
+		"--jsonl",
+		action="store_true",
+		help="Emit one compact JSON line per symbol as it is scanned (unranked) "
+		"instead of a single ranked document",
+	)
 	_add_tuning_args(sp)
 	sp.set_defaults(func=cmd_screen)
 
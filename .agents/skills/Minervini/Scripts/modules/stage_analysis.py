@@ -72,9 +72,9 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 import numpy as np
-import yfinance as yf
+from numpy.lib.stride_tricks import sliding_window_view
 from volume_analysis import _calc_up_down_ratio
-from utils import output_json, safe_run, calculate_sma
+from utils import output_json, safe_run, calculate_sma, fetch_history, trailing_run_length
 
 STAGE_NAMES = {
 	1: "Basing / Neglect (Consolidation)",
@@ -115,16 +115,20 @@ _DEFAULT_MIN_ADVANCE_WEEKS = 8  # a climax only ENDS a trend after a long advanc
 
 
 def _ma_slope(series, lookback=20):
-	"""Normalized slope (percent per day) of a moving average over `lookback`."""
+	"""Normalized slope (percent per day) of a moving average over `lookback`.
+
+	The x-axis is just 0..n-1, so the least-squares slope is the closed form
+	sum(xc * yc) / sum(xc**2) on centered values — no polyfit/lstsq call.
+	"""
 	if len(series) < lookback:
 		return 0.0
 	recent = series.dropna().tail(lookback)
 	if len(recent) < 2:
 		return 0.0
-	x = np.arange(len(recent))
 	y = recent.values.astype(float)
-	slope = np.polyfit(x, y, 1)[0]
 	mean_val = np.mean(y)
+	xc = np.arange(len(y)) - (len(y) - 1) / 2
+	slope = float(np.dot(xc, y - mean_val) / np.dot(xc, xc))
 	if mean_val == 0:
 		return 0.0
 	return (slope / mean_val) * 100
@@ -156,26 +160,15 @@ def _find_swing_points(series, confirmation_bars=5):
 	"""
 	values = series.values.astype(float)
 	n = len(values)
-	swing_highs = []
-	swing_lows = []
-
-	for i in range(confirmation_bars, n - confirmation_bars):
-		is_high = True
-		for j in range(1, confirmation_bars + 1):
-			if values[i] < values[i - j] or values[i] < values[i + j]:
-				is_high = False
-				break
-		if is_high:
-			swing_highs.append((i, float(values[i])))
-
-		is_low = True
-		for j in range(1, confirmation_bars + 1):
-			if values[i] > values[i - j] or values[i] > values[i + j]:
-				is_low = False
-				break
-		if is_low:
-			swing_lows.append((i, float(values[i])))
-
+	span = 2 * confirmation_bars + 1
+	if n < span:
+		return [], []
+
+	# Each bar's confirmation box as one strided view; a swing is the box extreme.
+	boxes = sliding_window_view(values, span)
+	center = values[confirmation_bars:n - confirmation_bars]
+	swing_highs = [(int(i), float(values[i])) for i in np.flatnonzero(center >= boxes.max(axis=1)) + confirmation_bars]
+	swing_lows = [(int(i), float(values[i])) for i in np.flatnonzero(center <= boxes.min(axis=1)) + confirmation_bars]
 	return swing_highs, swing_lows
 
 
@@ -244,17 +237,20 @@ def _decline_band(decline_pct):
 
 
 def _atr(highs, lows, closes, window):
-	"""Average true range over the last `window` bars."""
-	tr = np.maximum(
-		highs.values - lows.values,
-		np.maximum(
-			np.abs(highs.values - np.roll(closes.values, 1)),
-			np.abs(lows.values - np.roll(closes.values, 1)),
-		),
-	)
-	if len(tr) < window:
-		return float(np.mean(tr[1:])) if len(tr) > 1 else 0.0
-	return float(np.mean(tr[-window:]))
+	"""Average true range over the last `window` bars.
+
+	Only the tail being averaged is turned into true ranges — `window` bars plus
+	the close before them — rather than the whole multi-year history.
+	"""
+	n = len(closes)
+	if n < 2:
+		return 0.0
+	k = min(window, n - 1)
+	h = highs.to_numpy(dtype=float)[-k:]
+	l = lows.to_numpy(dtype=float)[-k:]
+	prev_c = closes.to_numpy(dtype=float)[-k - 1:-1]
+	tr = np.maximum(h - l, np.maximum(np.abs(h - prev_c), np.abs(l - prev_c)))
+	return float(np.mean(tr))
 
 
 # ---------------------------------------------------------------------------
@@ -295,8 +291,7 @@ def _classify_stage(price, s50, s150, s200, sma200_trend_pct, hh, hl, lh, ll):
 def cmd_classify(args):
 	"""Classify a stock into Stage 1-4 by structure."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	# Drop incomplete bars: yfinance appends a partial current-session row mid-day
 	# whose OHLC can be NaN, which would poison every downstream comparison.
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
@@ -311,21 +306,21 @@ def cmd_classify(args):
 	closes = data["Close"]
 	highs = data["High"]
 	lows = data["Low"]
-	current_price = float(closes.iloc[-1])
+	current_price = float(closes.to_numpy(dtype=float)[-1])
 	date_str = str(data.index[-1].date())
 
 	sma50 = calculate_sma(closes, 50)
 	sma150 = calculate_sma(closes, 150)
 	sma200 = calculate_sma(closes, 200)
-	c_sma50 = float(sma50.iloc[-1])
-	c_sma150 = float(sma150.iloc[-1])
-	c_sma200 = float(sma200.iloc[-1])
+	c_sma50 = float(sma50.to_numpy()[-1])
+	c_sma150 = float(sma150.to_numpy()[-1])
+	c_sma200 = float(sma200.to_numpy()[-1])
 
 	sma200_trend_pct = _sma200_trend_pct(sma200, args.ma_uptrend_days)
 	hh, hl, lh, ll = _trend_structure(highs, lows, args.swing_bars)
 
-	week52_low = float(lows.tail(252).min()) if len(lows) >= 252 else float(lows.min())
-	week52_high = float(highs.tail(252).max()) if len(highs) >= 252 else float(highs.max())
+	week52_low = float(lows.to_numpy(dtype=float)[-252:].min())
+	week52_high = float(highs.to_numpy(dtype=float)[-252:].max())
 	pct_above_52w_low = (current_price / week52_low - 1) * 100 if week52_low > 0 else 0.0
 	pct_below_52w_high = (current_price / week52_high - 1) * 100 if week52_high > 0 else 0.0
 
@@ -389,8 +384,7 @@ def cmd_transitions(args):
 	weeks.
 	"""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
 
 	if data.empty or len(data) < 200:
@@ -469,7 +463,7 @@ def cmd_transitions(args):
 
 	# 7. Relative strength improving vs S&P 500.
 	try:
-		spy = yf.Ticker("SPY").history(period="3mo")
+		spy = fetch_history("SPY", period="3mo")
 		spy_ret = (float(spy["Close"].iloc[-1]) / float(spy["Close"].iloc[0]) - 1) * 100
 		stk = closes.tail(_RS_LOOKBACK_DAYS)
 		stk_ret = (float(stk.iloc[-1]) / float(stk.iloc[0]) - 1) * 100
@@ -516,8 +510,7 @@ def cmd_risk(args):
 	   swings are an egg, not a ball.
 	"""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
 
 	if data.empty or len(data) < 200:
@@ -543,15 +536,17 @@ def cmd_risk(args):
 
 	# 2. Climax extension above the 50-day MA + range expansion + length of run.
 	extension_pct = (current_price / c_sma50 - 1) * 100 if c_sma50 > 0 else 0.0
-	adr = ((highs - lows) / closes * 100).astype(float)
-	adr_5d = float(adr.iloc[-_ADR_FAST:].mean())
-	adr_60d = float(adr.iloc[-_ADR_SLOW:].mean()) if len(adr) >= _ADR_SLOW else adr_5d
+	# Daily range % is only read over the slow window, so build just that tail.
+	adr_tail = (
+		(highs.to_numpy(dtype=float)[-_ADR_SLOW:] - lows.to_numpy(dtype=float)[-_ADR_SLOW:])
+		/ closes.to_numpy(dtype=float)[-_ADR_SLOW:]
+		* 100
+	)
+	adr_5d = float(np.mean(adr_tail[-_ADR_FAST:]))
+	adr_60d = float(np.mean(adr_tail)) if len(closes) >= _ADR_SLOW else adr_5d
 	range_expanding = adr_5d > _RANGE_EXPANSION_MULT * adr_60d if adr_60d > 0 else False
-	days_since_50ma = 0
-	for i in range(len(closes) - 1, -1, -1):
-		if float(closes.iloc[i]) <= float(sma50.iloc[i]):
-			break
-		days_since_50ma += 1
+	# Bars closing above the 50-day MA, counted back from today (warm-up NaN MA bars count as above).
+	days_since_50ma = trailing_run_length(~(closes.to_numpy(dtype=float) <= sma50.to_numpy(dtype=float)))
 	weeks_of_advance = days_since_50ma // 5
 	climactic = extension_pct > args.climax_extension_pct and range_expanding and weeks_of_advance >= args.min_advance_weeks
 
@@ -120,8 +120,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 import numpy as np
-import yfinance as yf
-from utils import output_json, safe_run
+from utils import fetch_history, output_json, safe_run
 
 # Scan-window ceiling: longest bar-run searched for a tight-close cluster.
 # Scales with the bar interval/timeframe, so it is also a tunable CLI default.
@@ -141,101 +140,120 @@ VOLUME_TREND_BAND = 0.15
 MIN_LIQUIDITY_THRESHOLD = 100000
 
 
-def _find_tight_clusters(closes, volumes, tolerance_pct, min_duration, max_window_ceiling=DEFAULT_MAX_WINDOW_DAILY):
+def _find_tight_clusters(closes, tolerance_pct, min_duration, max_window_ceiling=DEFAULT_MAX_WINDOW_DAILY):
 	"""Scan for consecutive close clusters within tolerance using sliding windows.
 
 	Uses multiple window sizes (min_duration to max_window) to find all
 	possible tight close clusters. For each window position, checks if
 	the spread between max and min close is within tolerance.
+
+	Qualifying windows overlap heavily and the merge keeps only a handful, so
+	they are recorded column-wise — (start_idx, end_idx, spread_pct) arrays,
+	just the merge keys — and full records are built for the survivors only.
+
+	Window extremes are grown, not recomputed: the min/max of every window of
+	size w is the size-(w-1) extreme folded with one more close, so each size
+	costs one vectorized pass over all start positions instead of a fresh
+	min/max per window. Spread never narrows as a window grows, so the scan
+	stops at the first size with no qualifying window.
 	"""
 	close_arr = closes.values.astype(float)
-	vol_arr = volumes.values.astype(float)
-	dates = closes.index
 	n = len(close_arr)
 	max_window = min(max_window_ceiling, n)
 
-	raw_clusters = []
-
-	for window in range(min_duration, max_window + 1):
-		for start in range(n - window + 1):
-			end = start + window - 1
-			segment = close_arr[start : end + 1]
-			min_close = float(np.min(segment))
-			max_close = float(np.max(segment))
-
-			if min_close <= 0:
-				continue
-
-			spread_pct = (max_close - min_close) / min_close * 100
-
-			if spread_pct <= tolerance_pct:
-				avg_close = float(np.mean(segment))
-				vol_segment = vol_arr[start : end + 1]
-				avg_volume = float(np.mean(vol_segment))
-
-				raw_clusters.append(
-					{
-						"start_idx": start,
-						"end_idx": end,
-						"start_date": str(dates[start].date()),
-						"end_date": str(dates[end].date()),
-						"duration": end - start + 1,
-						"min_close": round(min_close, 2),
-						"max_close": round(max_close, 2),
-						"spread_pct": round(spread_pct, 2),
-						"avg_close": round(avg_close, 2),
-						"avg_volume": round(avg_volume),
-					}
-				)
-
-	return raw_clusters
-
-
-def _merge_overlapping_clusters(clusters):
+	starts = []
+	ends = []
+	spreads = []
+
+	# Running extremes for windows of the current size, indexed by start position.
+	win_min = close_arr.copy()
+	win_max = close_arr.copy()
+	for window in range(1, max_window + 1):
+		if window > 1:
+			win_min = np.minimum(win_min[:-1], close_arr[window - 1 :])
+			win_max = np.maximum(win_max[:-1], close_arr[window - 1 :])
+		if window < min_duration:
+			continue
+
+		with np.errstate(divide="ignore", invalid="ignore"):
+			spread_pct = (win_max - win_min) / win_min * 100
+		hits = np.flatnonzero((win_min > 0) & (spread_pct <= tolerance_pct))
+		if hits.size == 0:
+			# A longer window contains a shorter one, so its spread can only be
+			# wider: once no window of this size qualifies, no larger one will.
+			break
+		starts.extend(hits.tolist())
+		ends.extend((hits + window - 1).tolist())
+		spreads.extend(round(sp, 2) for sp in spread_pct[hits].tolist())
+
+	return np.array(starts, dtype=int), np.array(ends, dtype=int), np.array(spreads, dtype=float)
+
+
+def _merge_overlapping_clusters(starts, ends, spreads):
 	"""Merge overlapping clusters, keeping the tightest spread.
 
 	Sorts clusters by start index then spread ascending. When two
 	clusters overlap, the one with tighter spread (lower spread_pct)
 	is kept. If spreads are equal, longer duration wins as tiebreaker.
+	Returns the positions (into the input arrays) of the kept clusters.
 	"""
-	if not clusters:
+	if len(starts) == 0:
 		return []
 
-	# Sort by start_idx ascending, then by spread_pct ascending (keep tightest)
-	sorted_clusters = sorted(clusters, key=lambda c: (c["start_idx"], c["spread_pct"]))
+	# Sort by start_idx ascending, then by spread_pct ascending (keep tightest);
+	# lexsort is stable, so equal keys keep scan order.
+	order = np.lexsort((spreads, starts))
+	durations = ends - starts + 1
 
 	merged = []
-	current = sorted_clusters[0]
+	current = order[0]
 
-	for cluster in sorted_clusters[1:]:
+	for k in order[1:]:
 		# Check overlap: next cluster starts before current ends
-		if cluster["start_idx"] <= current["end_idx"]:
+		if starts[k] <= ends[current]:
 			# Keep the one with tighter spread (lower spread_pct)
-			if cluster["spread_pct"] < current["spread_pct"]:
-				current = cluster
+			if spreads[k] < spreads[current]:
+				current = k
 			# If same spread, keep the one with longer duration as tiebreaker
-			elif cluster["spread_pct"] == current["spread_pct"] and cluster["duration"] > current["duration"]:
-				current = cluster
+			elif spreads[k] == spreads[current] and durations[k] > durations[current]:
+				current = k
 		else:
 			merged.append(current)
-			current = cluster
+			current = k
 
 	merged.append(current)
 	return merged
 
 
-def _classify_location(cluster, closes, highs, location_lookback=DEFAULT_LOCATION_LOOKBACK):
+def _build_cluster(close_arr, date_strs, start, end, spread_pct):
+	"""Start the output record for one merged cluster (price fields only).
+
+	Volume, location and quality are added in place by the caller, so each
+	surviving cluster is materialized as exactly one dict. `date_strs` holds
+	every bar's date already formatted as YYYY-MM-DD.
+	"""
+	segment = close_arr[start : end + 1]
+	return {
+		"start_date": date_strs[start],
+		"end_date": date_strs[end],
+		"duration_days": end - start + 1,
+		"min_close": round(float(np.min(segment)), 2),
+		"max_close": round(float(np.max(segment)), 2),
+		"spread_pct": spread_pct,
+		"spread_pct_unit": "(max_close - min_close) / min_close * 100",
+		"avg_close": round(float(np.mean(segment)), 2),
+	}
+
+
+def _classify_location(end, avg_close, close_arr, high_arr, location_lookback=DEFAULT_LOCATION_LOOKBACK):
 	"""Determine cluster location relative to recent price structure.
 
 	pivot_area: cluster avg close within 3% of recent high (potential breakout zone)
 	base_consolidation: more than 3% below high but in upper half of range
 	pullback: lower half of recent price range
 	"""
-	close_arr = closes.values.astype(float)
-	high_arr = highs.values.astype(float)
-
 	# Use data up to and including the cluster end
-	end_idx = min(cluster["end_idx"] + 1, len(high_arr))
+	end_idx = min(end + 1, len(high_arr))
 	lookback = min(location_lookback, end_idx)
 	recent_highs = high_arr[end_idx - lookback : end_idx]
 	recent_closes = close_arr[end_idx - lookback : end_idx]
@@ -245,7 +263,6 @@ def _classify_location(cluster, closes, highs, location_lookback=DEFAULT_LOCATIO
 
 	recent_high = float(np.max(recent_highs))
 	recent_low = float(np.min(recent_closes))
-	avg_close = cluster["avg_close"]
 
 	if recent_high <= 0:
 		return "base_consolidation"
@@ -265,7 +282,7 @@ def _classify_location(cluster, closes, highs, location_lookback=DEFAULT_LOCATIO
 	return "pullback"
 
 
-def _compute_volume_metrics(cluster, volumes, vol_50d_avg, min_liquidity_threshold=MIN_LIQUIDITY_THRESHOLD):
+def _compute_volume_metrics(start, end, vol_arr, vol_50d_avg, min_liquidity_threshold=MIN_LIQUIDITY_THRESHOLD):
 	"""Compute volume trend, dryup ratio, and liquidity flag for a cluster.
 
 	Volume trend compares average volume of first half vs second half.
@@ -273,9 +290,6 @@ def _compute_volume_metrics(cluster, volumes, vol_50d_avg, min_liquidity_thresho
 	low_liquidity flag is set when vol_50d_avg is below min_liquidity_threshold,
 	indicating that dryup readings may not reflect genuine institutional supply exhaustion.
 	"""
-	vol_arr = volumes.values.astype(float)
-	start = cluster["start_idx"]
-	end = cluster["end_idx"]
 	segment = vol_arr[start : end + 1]
 
 	low_liquidity = vol_50d_avg < min_liquidity_threshold
@@ -374,12 +388,14 @@ def _analyze_tight_closes(
 	classifies location, grades quality, and determines signal strength.
 	"""
 	closes = data["Close"]
-	highs = data["High"]
-	volumes = data["Volume"]
-	current_price = round(float(closes.iloc[-1]), 2)
-	date_str = str(data.index[-1].date())
+	close_arr = closes.values.astype(float)
+	high_arr = data["High"].values.astype(float)
+	vol_arr = data["Volume"].values.astype(float)
+	current_price = round(float(close_arr[-1]), 2)
+	# Every cluster reports its start/end dates; format the index once.
+	date_strs = data.index.strftime("%Y-%m-%d")
+	date_str = date_strs[-1]
 
-	vol_arr = volumes.values.astype(float)
 	vol_50d_avg = float(np.mean(vol_arr[-50:])) if len(vol_arr) >= 50 else float(np.mean(vol_arr))
 
 	# Set min duration based on interval
@@ -389,36 +405,23 @@ def _analyze_tight_closes(
 		min_duration = 2
 
 	# Find all tight close clusters
-	raw_clusters = _find_tight_clusters(closes, volumes, tolerance_pct, min_duration, max_window)
-
-	# Merge overlapping clusters
-	merged = _merge_overlapping_clusters(raw_clusters)
+	starts, ends, spreads = _find_tight_clusters(closes, tolerance_pct, min_duration, max_window)
 
-	# Enrich each cluster with volume metrics, location, and quality grade
+	# Merge overlapping clusters, then enrich each survivor with volume metrics,
+	# location, and quality grade. The price/volume arrays are materialized once
+	# above and shared by every cluster.
 	enriched_clusters = []
-	for cluster in merged:
-		location = _classify_location(cluster, closes, highs, location_lookback)
-		volume_trend, dryup_ratio, low_liquidity = _compute_volume_metrics(cluster, volumes, vol_50d_avg)
-
-		enriched = {
-			"start_date": cluster["start_date"],
-			"end_date": cluster["end_date"],
-			"duration_days": cluster["duration"],
-			"min_close": cluster["min_close"],
-			"max_close": cluster["max_close"],
-			"spread_pct": cluster["spread_pct"],
-			"spread_pct_unit": "(max_close - min_close) / min_close * 100",
-			"avg_close": cluster["avg_close"],
-			"volume_trend": volume_trend,
-			"volume_dryup_ratio": dryup_ratio,
-			"volume_dryup_ratio_unit": "cluster avg vol / 50d avg vol",
-			"low_liquidity": low_liquidity,
-			"location": location,
-		}
-
-		quality = _grade_cluster(enriched, interval)
-		enriched["quality"] = quality
-		enriched_clusters.append(enriched)
+	for k in _merge_overlapping_clusters(starts, ends, spreads):
+		start, end = int(starts[k]), int(ends[k])
+		cluster = _build_cluster(close_arr, date_strs, start, end, float(spreads[k]))
+		volume_trend, dryup_ratio, low_liquidity = _compute_volume_metrics(start, end, vol_arr, vol_50d_avg)
+		cluster["volume_trend"] = volume_trend
+		cluster["volume_dryup_ratio"] = dryup_ratio
+		cluster["volume_dryup_ratio_unit"] = "cluster avg vol / 50d avg vol"
+		cluster["low_liquidity"] = low_liquidity
+		cluster["location"] = _classify_location(end, cluster["avg_close"], close_arr, high_arr, location_lookback)
+		cluster["quality"] = _grade_cluster(cluster, interval)
+		enriched_clusters.append(cluster)
 
 	# Determine best cluster (highest quality, then longest duration, then tightest spread)
 	quality_order = {"high": 0, "moderate": 1, "low": 2}
@@ -485,8 +488,7 @@ def _analyze_tight_closes(
 def cmd_daily(args):
 	"""Detect tight closes on daily price data."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	# yfinance appends a partial in-session bar whose OHLC can be NaN; that NaN
 	# poisons closes.iloc[-1] and every comparison downstream. Drop it first.
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
@@ -512,8 +514,7 @@ def cmd_daily(args):
 def cmd_weekly(args):
 	"""Detect tight closes on weekly price data."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1wk")
+	data = fetch_history(symbol, period=args.period, interval="1wk")
 	# yfinance appends a partial in-session bar whose OHLC can be NaN; that NaN
 	# poisons closes.iloc[-1] and every comparison downstream. Drop it first.
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
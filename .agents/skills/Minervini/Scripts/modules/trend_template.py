@@ -78,17 +78,15 @@ import os
 import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
-import yfinance as yf
 from rs_ranking import compute_rs_score
-from utils import output_json, safe_run, calculate_sma
+from utils import output_json, safe_run, calculate_sma, fetch_history
 
 
 @safe_run
 def cmd_check(args):
 	"""Run 8-criteria Trend Template check."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	# Drop the partial current-session bar yfinance appends mid-day: its NaN OHLC
 	# would make current_price NaN and silently fail all 8 criteria (1/8 for a
 	# leader), turning the live gate into a blanket AVOID during market hours.
@@ -104,23 +102,25 @@ def cmd_check(args):
 		return
 
 	closes = data["Close"]
-	current_price = float(closes.iloc[-1])
+	# Scalar reads go through plain arrays, not the pandas positional indexer.
+	close_arr = closes.to_numpy(dtype=float)
+	current_price = float(close_arr[-1])
 	date_str = str(data.index[-1].date())
 
 	# Calculate moving averages
-	sma50 = calculate_sma(closes, 50)
-	sma150 = calculate_sma(closes, 150)
-	sma200 = calculate_sma(closes, 200)
+	sma50 = calculate_sma(closes, 50).to_numpy()
+	sma150 = calculate_sma(closes, 150).to_numpy()
+	sma200 = calculate_sma(closes, 200).to_numpy()
 
-	current_sma50 = float(sma50.iloc[-1])
-	current_sma150 = float(sma150.iloc[-1])
-	current_sma200 = float(sma200.iloc[-1])
+	current_sma50 = float(sma50[-1])
+	current_sma150 = float(sma150[-1])
+	current_sma200 = float(sma200[-1])
 
 	# 200-day MA from ~1 month ago (22 trading days)
-	sma200_1mo_ago = float(sma200.iloc[-22]) if len(sma200) >= 22 else float(sma200.iloc[0])
+	sma200_1mo_ago = float(sma200[-22]) if len(sma200) >= 22 else float(sma200[0])
 
 	# 52-week high and low
-	one_year_data = closes.tail(252) if len(closes) >= 252 else closes
+	one_year_data = close_arr[-252:]
 	week52_high = float(one_year_data.max())
 	week52_low = float(one_year_data.min())
 
@@ -3,10 +3,31 @@
 import datetime
 import functools
 import json
+import math
+import os
 import sys
+import time
 
+import numpy as np
 import pandas as pd
 
+try:
+	import orjson
+except ImportError:  # optional: output falls back to the stdlib encoder
+	orjson = None
+
+# --- price-history disk cache ---
+# The pipeline fans one symbol out to several module processes (trend_template,
+# stage_analysis, ...) that each pull the same OHLCV from Yahoo. Persisting each
+# (symbol, period, interval) response for a short window turns those repeat
+# round-trips into a local read. Files live under Scripts/.cache/history.
+HISTORY_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "history")
+# Session-level bars barely move within an hour; intraday bars go stale in minutes.
+HISTORY_CACHE_TTL_SECONDS = 60 * 60
+HISTORY_CACHE_INTRADAY_TTL_SECONDS = 5 * 60
+_INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+_OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
 
 def normalize(obj):
 	"""Convert pandas/numpy types to JSON-serializable Python objects."""
@@ -15,7 +36,7 @@ def normalize(obj):
 	if isinstance(obj, bool):
 		return obj
 	if isinstance(obj, float):
-		if obj != obj:  # NaN check
+		if not math.isfinite(obj):  # NaN/inf have no JSON form
 			return None
 		return obj
 	if isinstance(obj, (str, int)):
@@ -41,22 +62,58 @@ def normalize(obj):
 		return [normalize(v) for v in obj]
 	if hasattr(obj, "item"):  # numpy scalar
 		val = obj.item()
-		if isinstance(val, float) and val != val:
+		if isinstance(val, float) and not math.isfinite(val):
 			return None
 		return val
 	return str(obj)
 
 
+def _dump_json(obj):
+	"""Write already-normalized obj to stdout as 2-space-indented UTF-8 JSON.
+
+	orjson encodes in Rust several times faster than json.dump, which matters for
+	the large pipeline payloads. Anything it refuses (e.g. ints beyond 64 bits)
+	drops to the stdlib encoder. normalize() has already turned NaN/inf into None,
+	so both encoders emit the same null for them.
+	"""
+	if orjson is not None:
+		try:
+			sys.stdout.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+			print()
+			return
+		except TypeError:
+			pass
+	json.dump(obj, sys.stdout, ensure_ascii=False, indent=2)
+	print()
+
+
 def output_json(data):
 	"""Serialize data to JSON and print to stdout."""
-	json.dump(normalize(data), sys.stdout, ensure_ascii=False, indent=2)
-	print()
+	_dump_json(normalize(data))
+
+
+def output_json_line(data):
+	"""Serialize data as one compact JSON line (NDJSON) and flush it.
+
+	For batch commands that stream a record per symbol: a consumer can parse each
+	line as it arrives instead of waiting for, and re-parsing, one final array.
+	"""
+	obj = normalize(data)
+	line = None
+	if orjson is not None:
+		try:
+			line = orjson.dumps(obj).decode()
+		except TypeError:
+			pass
+	if line is None:
+		line = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+	sys.stdout.write(line + "\n")
+	sys.stdout.flush()
 
 
 def error_json(message, code=1):
 	"""Output error as JSON and exit."""
-	json.dump({"error": str(message)}, sys.stdout, ensure_ascii=False, indent=2)
-	print()
+	_dump_json({"error": str(message)})
 	sys.exit(code)
 
 
@@ -69,11 +126,10 @@ def output_json_records(data):
 	"""
 	if isinstance(data, pd.DataFrame):
 		if data.empty:
-			json.dump([], sys.stdout, ensure_ascii=False, indent=2)
+			_dump_json([])
 		else:
 			records = [{str(col): normalize(row[col]) for col in data.columns} for _, row in data.iterrows()]
-			json.dump(records, sys.stdout, ensure_ascii=False, indent=2)
-		print()
+			_dump_json(records)
 	else:
 		output_json(data)
 
@@ -109,6 +165,116 @@ def calculate_sma(prices, period):
 	return prices.rolling(window=period).mean()
 
 
+def trailing_run_length(mask):
+	"""How many consecutive True values `mask` ends with (0 if its last is False).
+
+	The "how long has this held" counts (days above the 50-day MA, days inside
+	the pause range) are a run-length on the tail: the distance from the end to
+	the last False, found in one pass instead of a reverse per-bar loop.
+	"""
+	breaks = np.flatnonzero(~np.asarray(mask, dtype=bool))
+	if breaks.size == 0:
+		return len(mask)
+	return int(len(mask) - 1 - breaks[-1])
+
+
+def _history_cache_path(symbol, period, interval, batch=False):
+	# yf.download frames differ from Ticker.history ones (tz-naive daily index,
+	# extra columns, all-NaN rows dropped), so batch entries get their own key.
+	key = f"{symbol.upper()}_{period}_{interval}{'_batch' if batch else ''}".replace(os.sep, "_")
+	return os.path.join(HISTORY_CACHE_DIR, key + ".pkl")
+
+
+def _read_cached_history(symbol, period, interval, batch=False):
+	"""The cached frame if it is still within its TTL, else None."""
+	path = _history_cache_path(symbol, period, interval, batch)
+	ttl = HISTORY_CACHE_INTRADAY_TTL_SECONDS if interval in _INTRADAY_INTERVALS else HISTORY_CACHE_TTL_SECONDS
+	try:
+		if time.time() - os.path.getmtime(path) < ttl:
+			return pd.read_pickle(path)
+	except Exception:
+		pass
+	return None
+
+
+def _write_cached_history(symbol, period, interval, data, batch=False):
+	if data.empty:
+		return
+	path = _history_cache_path(symbol, period, interval, batch)
+	try:
+		os.makedirs(HISTORY_CACHE_DIR, exist_ok=True)
+		tmp = f"{path}.{os.getpid()}.tmp"
+		data.to_pickle(tmp)
+		os.replace(tmp, path)  # atomic: parallel pipeline workers never read a half-written file
+	except OSError:
+		pass
+
+
+def fetch_history(symbol, period="1y", interval="1d"):
+	"""`yf.Ticker(symbol).history(period=..., interval=...)` behind a short-TTL disk cache.
+
+	A fresh file is served without touching the network; a stale, missing or
+	unreadable one falls through to Yahoo and is rewritten. Cache I/O failures
+	never fail the caller — at worst the fetch simply isn't cached. Empty frames
+	are not cached, so a transient Yahoo miss is retried on the next call.
+	"""
+	data = _read_cached_history(symbol, period, interval)
+	if data is None:
+		# Imported on first network fetch, not at module load: the pipeline entry
+		# point and rs_ranking use utils only for JSON plumbing, and yfinance alone
+		# costs ~0.35s of cold-start per process.
+		import yfinance as yf
+
+		data = yf.Ticker(symbol).history(period=period, interval=interval)
+		_write_cached_history(symbol, period, interval, data)
+	return data
+
+
+def fetch_history_batch(symbols, period="1y", interval="1d"):
+	"""{symbol: DataFrame} for a watchlist — cache hits from disk, misses in ONE download.
+
+	Per-symbol Ticker.history calls are serial HTTP round-trips; yf.download takes
+	the whole miss list and fetches it on its own thread pool. Each symbol's frame
+	is sliced out of the grouped result, trimmed of the dates only OTHER symbols
+	traded, and cached under a batch-only key: its shape is yf.download's, not
+	the Ticker.history frame fetch_history promises its callers. A symbol Yahoo
+	returns nothing for maps to an empty frame, so callers keep their own
+	insufficient-data path.
+	"""
+	frames = {}
+	misses = []
+	for symbol in dict.fromkeys(symbols):
+		cached = _read_cached_history(symbol, period, interval, batch=True)
+		if cached is None:
+			misses.append(symbol)
+		else:
+			frames[symbol] = cached
+
+	if misses:
+		import yfinance as yf
+
+		raw = yf.download(
+			misses,
+			period=period,
+			interval=interval,
+			group_by="ticker",
+			auto_adjust=True,
+			actions=True,
+			threads=True,
+			progress=False,
+		)
+		for symbol in misses:
+			if isinstance(raw.columns, pd.MultiIndex):
+				data = raw[symbol] if symbol in raw.columns.get_level_values(0) else pd.DataFrame(columns=_OHLCV_COLUMNS)
+			else:
+				data = raw
+			data = data.dropna(how="all")
+			_write_cached_history(symbol, period, interval, data, batch=True)
+			frames[symbol] = data
+
+	return frames
+
+
 def safe_run(func):
 	"""Decorator: wrap function in try/except with JSON error output."""
 
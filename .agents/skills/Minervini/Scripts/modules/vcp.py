@@ -179,8 +179,8 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 import numpy as np
-import yfinance as yf
-from utils import output_json, safe_run, max_constructive_depth_pct
+from numpy.lib.stride_tricks import sliding_window_view
+from utils import output_json, safe_run, fetch_history, max_constructive_depth_pct, trailing_run_length
 
 # --- Tier-1 defaults (overridable via `detect` CLI args; see main()) ---
 DEFAULT_MAX_DEPTH = 60.0  # absolute first-correction redline; duration-keyed ceiling caps quality below it
@@ -204,25 +204,20 @@ def _find_swing_points(highs, lows, closes, window=5):
 	A swing high is a high that is higher than `window` bars on each side.
 	A swing low is a low that is lower than `window` bars on each side.
 	"""
-	swing_highs = []
-	swing_lows = []
-
-	highs_arr = highs.values.astype(float)
-	lows_arr = lows.values.astype(float)
-
-	for i in range(window, len(highs_arr) - window):
-		# Swing high
-		if all(highs_arr[i] >= highs_arr[i - j] for j in range(1, window + 1)) and all(
-			highs_arr[i] >= highs_arr[i + j] for j in range(1, window + 1)
-		):
-			swing_highs.append((i, highs_arr[i]))
-
-		# Swing low
-		if all(lows_arr[i] <= lows_arr[i - j] for j in range(1, window + 1)) and all(
-			lows_arr[i] <= lows_arr[i + j] for j in range(1, window + 1)
-		):
-			swing_lows.append((i, lows_arr[i]))
-
+	highs_arr = highs.to_numpy(dtype=float)
+	lows_arr = lows.to_numpy(dtype=float)
+	span = 2 * window + 1
+	if len(highs_arr) < span:
+		return [], []
+
+	# Box high/low around every interior bar in one pass: row k of the (zero-copy)
+	# view is bars k..k+2*window, centred on bar k+window.
+	box_high = sliding_window_view(highs_arr, span).max(axis=1)
+	box_low = sliding_window_view(lows_arr, span).min(axis=1)
+	interior = slice(window, len(highs_arr) - window)
+
+	swing_highs = [(int(i), highs_arr[i]) for i in np.flatnonzero(highs_arr[interior] >= box_high) + window]
+	swing_lows = [(int(i), lows_arr[i]) for i in np.flatnonzero(lows_arr[interior] <= box_low) + window]
 	return swing_highs, swing_lows
 
 
@@ -236,18 +231,19 @@ def _detect_contractions(swing_highs, swing_lows, closes):
 		return []
 
 	contractions = []
-	used_lows = set()
+	# Swing lows come in bar order, so the first one after a high is a binary
+	# search away; only lows already claimed by an earlier high are stepped over.
+	low_positions = np.array([l_idx for l_idx, _ in swing_lows])
+	used_lows = np.zeros(len(swing_lows), dtype=bool)
 
 	for h_idx, h_price in swing_highs:
 		# Find the nearest swing low after this high
-		best_low = None
-		for l_idx, l_price in swing_lows:
-			if l_idx > h_idx and l_idx not in used_lows:
-				best_low = (l_idx, l_price)
-				break
+		k = int(np.searchsorted(low_positions, h_idx, side="right"))
+		while k < len(swing_lows) and used_lows[k]:
+			k += 1
 
-		if best_low is not None:
-			l_idx, l_price = best_low
+		if k < len(swing_lows):
+			l_idx, l_price = swing_lows[k]
 			depth_pct = (h_price - l_price) / h_price * 100
 			if depth_pct > 2:  # Minimum 2% to count as a contraction
 				contractions.append(
@@ -259,7 +255,7 @@ def _detect_contractions(swing_highs, swing_lows, closes):
 						"depth_pct": round(depth_pct, 2),
 					}
 				)
-				used_lows.add(l_idx)
+				used_lows[k] = True
 
 	return contractions
 
@@ -306,7 +302,7 @@ def _analyze_contraction_volume(volumes, contractions):
 	high-to-low span. Computes volume ratios between successive contractions
 	to determine if volume is declining (supply drying up).
 	"""
-	vol_arr = volumes.values.astype(float)
+	vol_arr = volumes.to_numpy(dtype=float)
 	avg_volumes = []
 	for c in contractions:
 		start = c["high_idx"]
@@ -339,7 +335,7 @@ def _check_volume_dryup(volumes, base_start_idx, pivot_idx, lookback=10, dryup_p
 	Compares average volume in the pivot area (last ``lookback`` days before
 	the pivot) against the average volume across the entire base formation.
 	"""
-	vol_arr = volumes.values.astype(float)
+	vol_arr = volumes.to_numpy(dtype=float)
 
 	pivot_start = max(base_start_idx, pivot_idx - lookback)
 	pivot_area = vol_arr[pivot_start : pivot_idx + 1]
@@ -373,8 +369,8 @@ def _assess_breakout_volume(volumes, closes, pivot_price=None, breakout_vol_mult
 	any of the last 5 trading days had an up-close on breakout-level
 	volume (>= 125% of 50-day average) near the pivot price (within 2%).
 	"""
-	vol_arr = volumes.values.astype(float)
-	close_arr = closes.values.astype(float)
+	vol_arr = volumes.to_numpy(dtype=float)
+	close_arr = closes.to_numpy(dtype=float)
 	vol_50d_avg = float(np.mean(vol_arr[-50:])) if len(vol_arr) >= 50 else float(np.mean(vol_arr))
 	current_vol = float(vol_arr[-1])
 	current_vs_avg_pct = round(current_vol / vol_50d_avg * 100, 1) if vol_50d_avg > 0 else 0.0
@@ -382,13 +378,11 @@ def _assess_breakout_volume(volumes, closes, pivot_price=None, breakout_vol_mult
 	# Check last 5 days for breakout-level volume on an up day near the pivot
 	breakout_confirmed = False
 	if len(vol_arr) >= 6 and len(close_arr) >= 6:
-		for i in range(-5, 0):
-			price_up = close_arr[i] > close_arr[i - 1]
-			vol_above = vol_arr[i] >= vol_50d_avg * breakout_vol_mult
-			near_pivot = close_arr[i] >= pivot_price * PIVOT_PROXIMITY_PCT if pivot_price else True
-			if price_up and vol_above and near_pivot:
-				breakout_confirmed = True
-				break
+		recent_close = close_arr[-5:]
+		price_up = recent_close > close_arr[-6:-1]
+		vol_above = vol_arr[-5:] >= vol_50d_avg * breakout_vol_mult
+		near_pivot = recent_close >= pivot_price * PIVOT_PROXIMITY_PCT if pivot_price else True
+		breakout_confirmed = bool(np.any(price_up & vol_above & near_pivot))
 
 	return {
 		"vol_50d_avg": round(vol_50d_avg),
@@ -425,9 +419,9 @@ def _detect_shakeouts(lows, closes, volumes, swing_lows, contractions, vol_50d_a
 			"shakeouts_detail": [],
 		}
 
-	lows_arr = lows.values.astype(float)
-	close_arr = closes.values.astype(float)
-	vol_arr = volumes.values.astype(float)
+	lows_arr = lows.to_numpy(dtype=float)
+	close_arr = closes.to_numpy(dtype=float)
+	vol_arr = volumes.to_numpy(dtype=float)
 	dates = lows.index
 
 	base_start = contractions[0]["high_idx"]
@@ -439,60 +433,58 @@ def _detect_shakeouts(lows, closes, volumes, swing_lows, contractions, vol_50d_a
 	for i, (sl_idx, sl_price) in enumerate(swing_lows):
 		if sl_idx < base_start or sl_idx > base_end:
 			continue
-		# Check if a subsequent low undercuts this swing low
-		for j in range(sl_idx + 1, min(sl_idx + search_bars, len(lows_arr))):
-			if j > base_end + 10:
-				break
-			if lows_arr[j] < sl_price:
-				# Undercut detected -- measure recovery
-				recovered = False
-				surge = False
-				duration_below = 0
-				recovery_vol_ratio = 0.0
-				reclaimed = False
-
-				for k in range(j, min(j + search_bars, len(lows_arr))):
-					if close_arr[k] < sl_price:
-						duration_below += 1
-					else:
-						reclaimed = True
-						if k > j:
-							recovery_vol_ratio = round(vol_arr[k] / vol_50d_avg, 2) if vol_50d_avg > 0 else 0.0
-							surge = recovery_vol_ratio >= SHAKEOUT_RECOVERY_SURGE_MULT
-						recovered = True
-						break
-
-				if recovered:
-					if sl_idx >= pivot_zone_start:
-						loc = "pivot_area"
-					elif sl_idx >= base_mid:
-						loc = "right_side"
-					elif sl_idx <= base_start + (base_mid - base_start) // 3:
-						loc = "base_bottom"
-					else:
-						loc = "handle"
-
-					# Grade: constructive / neutral / destructive
-					if duration_below <= 3 and surge:
-						grade = "constructive"
-					elif duration_below >= 5 or (duration_below >= 3 and not surge):
-						grade = "destructive"
-					else:
-						grade = "neutral"
-
-					shakeouts.append(
-						{
-							"idx": j,
-							"date": str(dates[j].date()) if j < len(dates) else None,
-							"location": loc,
-							"volume_surge": surge,
-							"duration_below_days": duration_below,
-							"recovery_volume_ratio": recovery_vol_ratio,
-							"reclaimed_support": reclaimed,
-							"grade": grade,
-						}
-					)
-				break  # only count one undercut per swing low
+		# First subsequent low that undercuts this swing low (only one undercut
+		# is counted per swing low), found with one mask over the search window
+		scan_end = min(sl_idx + search_bars, len(lows_arr), base_end + 11)
+		undercuts = np.flatnonzero(lows_arr[sl_idx + 1:scan_end] < sl_price)
+		if undercuts.size == 0:
+			continue
+		j = sl_idx + 1 + int(undercuts[0])
+
+		# Measure recovery: the first close back at or above the swing low
+		# (a shakeout that never closes back inside the window is not counted)
+		recoveries = np.flatnonzero(~(close_arr[j:min(j + search_bars, len(lows_arr))] < sl_price))
+		if recoveries.size == 0:
+			continue
+
+		duration_below = int(recoveries[0])
+		k = j + duration_below
+		reclaimed = True
+		surge = False
+		recovery_vol_ratio = 0.0
+		if k > j:
+			recovery_vol_ratio = round(vol_arr[k] / vol_50d_avg, 2) if vol_50d_avg > 0 else 0.0
+			surge = recovery_vol_ratio >= SHAKEOUT_RECOVERY_SURGE_MULT
+
+		if sl_idx >= pivot_zone_start:
+			loc = "pivot_area"
+		elif sl_idx >= base_mid:
+			loc = "right_side"
+		elif sl_idx <= base_start + (base_mid - base_start) // 3:
+			loc = "base_bottom"
+		else:
+			loc = "handle"
+
+		# Grade: constructive / neutral / destructive
+		if duration_below <= 3 and surge:
+			grade = "constructive"
+		elif duration_below >= 5 or (duration_below >= 3 and not surge):
+			grade = "destructive"
+		else:
+			grade = "neutral"
+
+		shakeouts.append(
+			{
+				"idx": j,
+				"date": str(dates[j].date()) if j < len(dates) else None,
+				"location": loc,
+				"volume_surge": surge,
+				"duration_below_days": duration_below,
+				"recovery_volume_ratio": recovery_vol_ratio,
+				"reclaimed_support": reclaimed,
+				"grade": grade,
+			}
+		)
 
 	# Shakeout quality score (0-10)
 	raw_score = 0
@@ -584,25 +576,28 @@ def _detect_demand_evidence(closes, volumes, contractions, shakeout_result, vol_
 			"post_shakeout_demand": False,
 		}
 
-	close_arr = closes.values.astype(float)
-	vol_arr = volumes.values.astype(float)
+	close_arr = closes.to_numpy(dtype=float)
+	vol_arr = volumes.to_numpy(dtype=float)
 	spike_threshold = vol_50d_avg * DEMAND_SPIKE_MULT
 
 	base_low_idx = min(c["low_idx"] for c in contractions)
 	base_start = contractions[0]["high_idx"]
 	base_end = contractions[-1]["low_idx"]
 
+	# Prefix counts of up-day / down-day volume spikes: cum[k] counts bars 1..k-1,
+	# so the spikes in any bar range [a, b) are cum[b] - cum[a].
+	n = len(close_arr)
+	heavy = vol_arr[1:] >= spike_threshold
+	up_cum = np.concatenate(([0, 0], np.cumsum((close_arr[1:] > close_arr[:-1]) & heavy)))
+	down_cum = np.concatenate(([0, 0], np.cumsum((close_arr[1:] < close_arr[:-1]) & heavy)))
+
 	# Left side: base_start to base_low -- count volume spikes on down-days
-	left_down_spikes = 0
-	for i in range(base_start + 1, min(base_low_idx + 1, len(close_arr))):
-		if close_arr[i] < close_arr[i - 1] and vol_arr[i] >= spike_threshold:
-			left_down_spikes += 1
+	a, b = base_start + 1, min(base_low_idx + 1, n)
+	left_down_spikes = int(down_cum[b] - down_cum[a]) if b > a else 0
 
 	# Right side: base_low to base_end -- count volume spikes on up-days
-	right_up_spikes = 0
-	for i in range(base_low_idx + 1, min(base_end + 1, len(close_arr))):
-		if close_arr[i] > close_arr[i - 1] and vol_arr[i] >= spike_threshold:
-			right_up_spikes += 1
+	a, b = base_low_idx + 1, min(base_end + 1, n)
+	right_up_spikes = int(up_cum[b] - up_cum[a]) if b > a else 0
 
 	demand_dominance = right_up_spikes > left_down_spikes
 
@@ -611,14 +606,11 @@ def _detect_demand_evidence(closes, volumes, contractions, shakeout_result, vol_
 	if shakeout_result.get("has_constructive_shakeout"):
 		last_date = shakeout_result.get("last_shakeout_date")
 		if last_date:
-			dates = closes.index
-			date_strs = [str(d.date()) for d in dates]
-			if last_date in date_strs:
-				shake_idx = date_strs.index(last_date)
-				for k in range(shake_idx + 1, min(shake_idx + 4, len(close_arr))):
-					if close_arr[k] > close_arr[k - 1] and vol_arr[k] >= spike_threshold:
-						post_shakeout_demand = True
-						break
+			matches = np.flatnonzero(closes.index.strftime("%Y-%m-%d") == last_date)
+			if len(matches):
+				shake_idx = int(matches[0])
+				a, b = shake_idx + 1, min(shake_idx + 4, n)
+				post_shakeout_demand = bool(b > a and up_cum[b] > up_cum[a])
 
 	return {
 		"right_side_up_spikes": right_up_spikes,
@@ -635,10 +627,10 @@ def _check_pivot_tightness(highs, lows, closes, volumes, pivot_idx, base_start_i
 	little change in price from one day to the next.  Tight, low-volume
 	pivots produce more reliable breakouts.
 	"""
-	high_arr = highs.values.astype(float)
-	low_arr = lows.values.astype(float)
-	close_arr = closes.values.astype(float)
-	vol_arr = volumes.values.astype(float)
+	high_arr = highs.to_numpy(dtype=float)
+	low_arr = lows.to_numpy(dtype=float)
+	close_arr = closes.to_numpy(dtype=float)
+	vol_arr = volumes.to_numpy(dtype=float)
 
 	if pivot_idx < 5 or pivot_idx >= len(close_arr):
 		return {
@@ -660,22 +652,23 @@ def _check_pivot_tightness(highs, lows, closes, volumes, pivot_idx, base_start_i
 	atr_ratio = round(atr_5d / atr_baseline, 2) if atr_baseline > 0 else 1.0
 
 	# Max close-to-close change in last 5 days (%)
-	max_cc_change = 0.0
-	for i in range(pivot_start + 1, pivot_idx + 1):
-		if close_arr[i - 1] > 0:
-			change = abs(close_arr[i] - close_arr[i - 1]) / close_arr[i - 1] * 100
-			max_cc_change = max(max_cc_change, change)
-	max_cc_change = round(max_cc_change, 2)
+	prev_close = close_arr[pivot_start:pivot_idx]
+	next_close = close_arr[pivot_start + 1 : pivot_idx + 1]
+	priced = prev_close > 0
+	cc_changes = np.abs(next_close[priced] - prev_close[priced]) / prev_close[priced] * 100
+	# fmax skips a NaN change the way the running max() it replaces did.
+	max_cc_change = round(float(np.fmax.reduce(cc_changes, initial=0.0)), 2)
 
 	# Pre-pivot volume percentile (5-day avg ranked within base rolling windows)
 	pivot_vol_avg = float(np.mean(vol_arr[pivot_start : pivot_idx + 1]))
 	base_span = pivot_idx - base_start_idx
 	if base_span >= 10:
-		window_avgs = []
-		for w in range(base_start_idx, pivot_idx - 4):
-			window_avgs.append(float(np.mean(vol_arr[w : w + 5])))
-		if window_avgs:
-			rank = sum(1 for v in window_avgs if v <= pivot_vol_avg)
+		# Every 5-day window average in the base off one prefix sum (two lookups
+		# per window instead of re-summing each slice).
+		csum = np.concatenate(([0.0], np.cumsum(vol_arr[base_start_idx:pivot_idx], dtype=float)))
+		window_avgs = (csum[5:] - csum[:-5]) / 5
+		if len(window_avgs):
+			rank = int(np.count_nonzero(window_avgs <= pivot_vol_avg))
 			percentile = round(rank / len(window_avgs) * 100, 1)
 		else:
 			percentile = 50.0
@@ -699,10 +692,10 @@ def _detect_cup_and_handle(highs, lows, closes, volumes, vol_50d_avg):
 	Cup depth 12-35% ideal (up to 50% acceptable), handle depth < 50% of cup,
 	and declining volume during handle.
 	"""
-	high_arr = highs.values.astype(float)
-	low_arr = lows.values.astype(float)
-	close_arr = closes.values.astype(float)
-	vol_arr = volumes.values.astype(float)
+	high_arr = highs.to_numpy(dtype=float)
+	low_arr = lows.to_numpy(dtype=float)
+	close_arr = closes.to_numpy(dtype=float)
+	vol_arr = volumes.to_numpy(dtype=float)
 	n = len(close_arr)
 
 	if n < 60:
@@ -831,10 +824,8 @@ def _detect_power_play(opens, highs, closes, volumes, vol_50d_avg, advance_bars=
 	over 3-6 weeks. This is a velocity pattern signaling dramatic shift in
 	company prospects. We use 50%+ as acceptable threshold since 100% is rare.
 	"""
-	close_arr = closes.values.astype(float)
-	high_arr = highs.values.astype(float)
-	low_arr = closes.index  # just for dates
-	vol_arr = volumes.values.astype(float)
+	close_arr = closes.to_numpy(dtype=float)
+	vol_arr = volumes.to_numpy(dtype=float)
 	n = len(close_arr)
 	dates = closes.index
 
@@ -844,41 +835,51 @@ def _detect_power_play(opens, highs, closes, volumes, vol_50d_avg, advance_bars=
 	# Scan for rapid advance: find any 40-day window with 50%+ gain
 	best_play = None
 	scan_end = n - 15  # Need at least 15 days after advance for consolidation
+	consol_max_bars = 30  # Max 30 days (6 weeks) consolidation; min 15 (3 weeks) is guaranteed by scan_end
 
-	for end_i in range(advance_bars, scan_end):
-		start_i = end_i - advance_bars
-		advance_pct = (close_arr[end_i] - close_arr[start_i]) / close_arr[start_i] * 100
-
-		if advance_pct < 50.0:
-			continue
+	if scan_end <= advance_bars:
+		return {"detected": False, "reason": "no_50pct_advance_with_tight_consolidation"}
 
-		# Found 50%+ advance in advance_bars days. Now check consolidation after.
-		advance_high = float(np.max(high_arr[start_i:end_i + 1]))
+	# Window extremes for every candidate end bar in one rolling pass each, instead
+	# of re-slicing max/min per bar: the advance window trails end_i, the
+	# consolidation window leads it (a reversed rolling, truncated at the last bar).
+	advance_high_arr = highs.rolling(advance_bars + 1).max().to_numpy(dtype=float)
+	fwd_high_arr = highs.iloc[::-1].rolling(consol_max_bars, min_periods=1).max().to_numpy(dtype=float)[::-1]
+	fwd_low_arr = closes.iloc[::-1].rolling(consol_max_bars, min_periods=1).min().to_numpy(dtype=float)[::-1]  # use closes for range
+
+	end_idx = np.arange(advance_bars, scan_end)
+	start_idx = end_idx - advance_bars
+	advance_pct_arr = (close_arr[end_idx] - close_arr[start_idx]) / close_arr[start_idx] * 100
+	advance_high_win = advance_high_arr[end_idx]
+	consol_high_win = fwd_high_arr[end_idx + 1]
+	consol_low_win = fwd_low_arr[end_idx + 1]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		consol_range_arr = np.where(consol_low_win > 0, (consol_high_win - consol_low_win) / consol_low_win * 100, 999)
+		# Correction from advance high
+		correction_arr = (advance_high_win - consol_low_win) / advance_high_win * 100
+
+	# 50%+ advance, not too deep (<= 25%), consolidation not too wide (<= 20%)
+	candidates = np.nonzero((advance_pct_arr >= 50.0) & (correction_arr <= 25.0) & (consol_range_arr <= 20.0))[0]
+
+	# Prefer the largest advance (compared against the rounded figure that is
+	# reported); only the winner's volume profile and dates are materialized.
+	best_k = None
+	best_adv = None
+	for k in candidates:
+		advance_pct = float(advance_pct_arr[k])
+		if best_k is None or advance_pct > best_adv:
+			best_k = int(k)
+			best_adv = round(advance_pct, 1)
+
+	if best_k is not None:
+		end_i = int(end_idx[best_k])
+		start_i = end_i - advance_bars
 		consol_start = end_i + 1
-		consol_end = min(consol_start + 30, n)  # Max 30 days (6 weeks) consolidation
+		consol_end = min(consol_start + consol_max_bars, n)
 		consol_bars = consol_end - consol_start
 
-		if consol_bars < 15:  # Min 15 days (3 weeks)
-			continue
-
-		consol_highs = high_arr[consol_start:consol_end]
-		consol_lows = close_arr[consol_start:consol_end]  # use closes for range
-		consol_vols = vol_arr[consol_start:consol_end]
-
-		consol_high = float(np.max(consol_highs))
-		consol_low = float(np.min(consol_lows))
-		consol_range_pct = (consol_high - consol_low) / consol_low * 100 if consol_low > 0 else 999
-
-		# Correction from advance high
-		correction_from_high = (advance_high - consol_low) / advance_high * 100
-
-		if correction_from_high > 25.0:
-			continue  # Too deep — not a power play
-
-		if consol_range_pct > 20.0:
-			continue  # Consolidation too wide
-
 		# Volume contracting during consolidation
+		consol_vols = vol_arr[consol_start:consol_end]
 		if len(consol_vols) >= 6:
 			first_half = float(np.mean(consol_vols[:len(consol_vols) // 2]))
 			second_half = float(np.mean(consol_vols[len(consol_vols) // 2:]))
@@ -886,21 +887,17 @@ def _detect_power_play(opens, highs, closes, volumes, vol_50d_avg, advance_bars=
 		else:
 			vol_contracting = True
 
-		pivot = round(float(np.max(consol_highs)), 2)
-
-		# Prefer the largest advance
-		if best_play is None or advance_pct > best_play["advance_pct"]:
-			best_play = {
-				"advance_pct": round(advance_pct, 1),
-				"advance_days": advance_bars,
-				"advance_start_date": str(dates[start_i].date()),
-				"advance_end_date": str(dates[end_i].date()),
-				"consolidation_days": consol_bars,
-				"consolidation_range_pct": round(consol_range_pct, 2),
-				"correction_from_high_pct": round(correction_from_high, 2),
-				"volume_contracting": vol_contracting,
-				"pivot_price": pivot,
-			}
+		best_play = {
+			"advance_pct": best_adv,
+			"advance_days": advance_bars,
+			"advance_start_date": str(dates[start_i].date()),
+			"advance_end_date": str(dates[end_i].date()),
+			"consolidation_days": consol_bars,
+			"consolidation_range_pct": round(float(consol_range_arr[best_k]), 2),
+			"correction_from_high_pct": round(float(correction_arr[best_k]), 2),
+			"volume_contracting": vol_contracting,
+			"pivot_price": round(float(consol_high_win[best_k]), 2),
+		}
 
 	if best_play is None:
 		return {"detected": False, "reason": "no_50pct_advance_with_tight_consolidation"}
@@ -946,10 +943,10 @@ def _detect_3c_entry(closes, highs, lows, volumes, vol_50d_avg, pause_bars=DEFAU
 		>>> result["detected"]
 		True
 	"""
-	close_arr = closes.values.astype(float)
-	high_arr = highs.values.astype(float)
-	low_arr = lows.values.astype(float)
-	vol_arr = volumes.values.astype(float)
+	close_arr = closes.to_numpy(dtype=float)
+	high_arr = highs.to_numpy(dtype=float)
+	low_arr = lows.to_numpy(dtype=float)
+	vol_arr = volumes.to_numpy(dtype=float)
 	n = len(close_arr)
 
 	if n < 60:
@@ -995,12 +992,7 @@ def _detect_3c_entry(closes, highs, lows, volumes, vol_50d_avg, pause_bars=DEFAU
 		return {"detected": False, "reason": f"pause_range_{round(pause_range_pct, 1)}pct_outside_3_12_range"}
 
 	# Calculate pause duration (consecutive days within the range)
-	pause_duration = 0
-	for i in range(len(pause_segment) - 1, -1, -1):
-		if pause_low <= pause_segment[i] <= pause_high:
-			pause_duration += 1
-		else:
-			break
+	pause_duration = trailing_run_length((pause_segment >= pause_low) & (pause_segment <= pause_high))
 
 	if pause_duration < 5:
 		return {"detected": False, "reason": f"pause_duration_{pause_duration}d_too_short"}
@@ -1232,8 +1224,7 @@ def _calculate_setup_readiness(
 def cmd_detect(args):
 	"""Detect VCP pattern in a ticker's price data."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval=args.interval)
+	data = fetch_history(symbol, period=args.period, interval=args.interval)
 	# Drop the partial current-session bar yfinance appends mid-day (NaN OHLC).
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
 
@@ -1253,10 +1244,12 @@ def cmd_detect(args):
 		)
 		return
 
-	closes = data["Close"]
-	highs = data["High"]
-	lows = data["Low"]
-	volumes = data["Volume"]
+	# Columns are read once as float64 here; the detectors' to_numpy(dtype=float)
+	# then hands back views of these instead of each copying its own arrays.
+	closes = data["Close"].astype(float)
+	highs = data["High"].astype(float)
+	lows = data["Low"].astype(float)
+	volumes = data["Volume"].astype(float)
 	current_price = float(closes.iloc[-1])
 
 	# Find swing points
@@ -1360,7 +1353,7 @@ def cmd_detect(args):
 	cup_completion_cheat = _detect_3c_entry(closes, highs, lows, volumes, breakout_vol["vol_50d_avg"], pause_bars=args.cheat_pause_bars)
 
 	# Power Play detection
-	opens = data["Open"]
+	opens = data["Open"].astype(float)
 	power_play = _detect_power_play(opens, highs, closes, volumes, breakout_vol["vol_50d_avg"], advance_bars=args.powerplay_advance_bars)
 
 	# Contraction ratio grades
@@ -1386,10 +1379,10 @@ def cmd_detect(args):
 		first_c = relevant_contractions[0]
 		stock_corr = first_c["depth_pct"]
 		try:
-			spy_data = yf.Ticker("SPY").history(period=args.period, interval=args.interval)
+			spy_data = fetch_history("SPY", period=args.period, interval=args.interval)
 			if not spy_data.empty and len(spy_data) >= len(data):
 				# Map stock contraction indices to SPY data
-				spy_closes = spy_data["Close"].values.astype(float)
+				spy_closes = spy_data["Close"].to_numpy(dtype=float)
 				c_high_idx = first_c["high_idx"]
 				c_low_idx = first_c["low_idx"]
 				if c_high_idx < len(spy_closes) and c_low_idx < len(spy_closes):
@@ -83,8 +83,8 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 import numpy as np
-import yfinance as yf
-from utils import calculate_sma, output_json, safe_run
+from numpy.lib.stride_tricks import sliding_window_view
+from utils import calculate_sma, fetch_history, output_json, safe_run
 
 # --- analyze: tunable lookback horizons (CLI-overridable defaults) ---
 # The institutional supply/demand window; scales with how much base history matters.
@@ -163,44 +163,56 @@ def _calc_up_down_ratio(volumes, closes, lookback):
 	return round(up_vol / down_vol, 3), up_vol, down_vol
 
 
-def _count_distribution_days(volumes, closes, vol_50avg, lookback=50):
-	"""Count distribution days in the last N trading days.
+def _daily_pct_changes(closes):
+	"""Close-to-close % change as an array; element 0 (no prior close) and zero priors read 0."""
+	c = closes.to_numpy(dtype=float)
+	pct = np.zeros(len(c))
+	if len(c) > 1:
+		prev = c[:-1]
+		with np.errstate(divide="ignore", invalid="ignore"):
+			pct[1:] = np.where(prev != 0, (c[1:] / prev - 1) * 100, 0.0)
+	return pct
 
-	Distribution day: price declines on above-average volume.
-	"""
-	recent_vol = volumes.tail(lookback)
-	recent_close = closes.tail(lookback)
-	price_change = recent_close.diff()
 
-	count = 0
-	dates = []
-	for i in range(1, len(recent_vol)):
-		pct_change = (recent_close.iloc[i] / recent_close.iloc[i - 1] - 1) * 100 if recent_close.iloc[i - 1] != 0 else 0
-		if pct_change <= -DIST_ACC_PRICE_THRESHOLD_PCT and recent_vol.iloc[i] > vol_50avg:
-			count += 1
-			dates.append(str(recent_close.index[i].date()))
+def _day_directions(closes):
+	"""Per-bar close-to-close direction as int8 codes: +1 up, -1 down, 0 flat.
 
-	return count, dates
+	Bar 0 (no prior close) and NaN changes read 0. The up/down classifiers below
+	all mask off this one array instead of re-testing the diff bar by bar.
+	"""
+	c = closes.to_numpy(dtype=float)
+	codes = np.zeros(len(c), dtype=np.int8)
+	if len(c) > 1:
+		d = np.diff(c)
+		codes[1:] = (d > 0).astype(np.int8) - (d < 0).astype(np.int8)
+	return codes
 
 
-def _count_accumulation_days(volumes, closes, vol_50avg, lookback=50):
-	"""Count accumulation days in the last N trading days.
+def _count_acc_dist_days(volumes, closes, vol_50avg, lookback=50):
+	"""Count accumulation and distribution days in the last N trading days.
 
 	Accumulation day: price rises on above-average volume.
+	Distribution day: price declines on above-average volume.
+
+	Both read the same %-change and heavy-volume arrays, so they are classified
+	in one pass. Returns (acc_count, acc_dates, dist_count, dist_dates).
 	"""
 	recent_vol = volumes.tail(lookback)
 	recent_close = closes.tail(lookback)
-	price_change = recent_close.diff()
 
-	count = 0
-	dates = []
-	for i in range(1, len(recent_vol)):
-		pct_change = (recent_close.iloc[i] / recent_close.iloc[i - 1] - 1) * 100 if recent_close.iloc[i - 1] != 0 else 0
-		if pct_change >= DIST_ACC_PRICE_THRESHOLD_PCT and recent_vol.iloc[i] > vol_50avg:
-			count += 1
-			dates.append(str(recent_close.index[i].date()))
+	pct_change = _daily_pct_changes(recent_close)
+	heavy = recent_vol.to_numpy(dtype=float) > vol_50avg
+	heavy[:1] = False
+	acc_mask = heavy & (pct_change >= DIST_ACC_PRICE_THRESHOLD_PCT)
+	dist_mask = heavy & (pct_change <= -DIST_ACC_PRICE_THRESHOLD_PCT)
 
-	return count, dates
+	hits = np.nonzero(acc_mask | dist_mask)[0]
+	hit_dates = recent_close.index[hits].strftime("%Y-%m-%d")
+	is_acc = acc_mask[hits]
+	acc_dates = list(hit_dates[is_acc])
+	dist_dates = list(hit_dates[~is_acc])
+
+	return len(acc_dates), acc_dates, len(dist_dates), dist_dates
 
 
 def _calc_count_ratio(closes, lookback):
@@ -213,16 +225,9 @@ def _calc_count_ratio(closes, lookback):
 	algebraically identical to `_calc_up_down_ratio` — so it was removed as a
 	redundant field and the grade now reads `_calc_up_down_ratio` directly.
 	"""
-	recent_close = closes.tail(lookback)
-	price_change = recent_close.diff()
-
-	count_up = 0
-	count_down = 0
-	for i in range(1, len(recent_close)):
-		if price_change.iloc[i] > 0:
-			count_up += 1
-		elif price_change.iloc[i] < 0:
-			count_down += 1
+	directions = _day_directions(closes.tail(lookback))
+	count_up = int(np.count_nonzero(directions == 1))
+	count_down = int(np.count_nonzero(directions == -1))
 
 	return round(count_up / count_down, 3) if count_down > 0 else 2.0
 
@@ -268,11 +273,10 @@ def _check_pullback_volume(volumes, closes, lookback=20):
 	if last_5_change >= 0:
 		return None, "not_in_pullback"
 
-	# During pullback, is volume declining?
-	down_days_vol = []
-	for i in range(len(recent_vol) - 10, len(recent_vol)):
-		if i >= 0 and price_change.iloc[i] < 0:
-			down_days_vol.append(float(recent_vol.iloc[i]))
+	# During pullback, is volume declining? (down days among the last 10 bars)
+	last_10_vol = recent_vol.to_numpy(dtype=float)[-10:]
+	last_10_change = price_change.to_numpy(dtype=float)[-10:]
+	down_days_vol = last_10_vol[last_10_change < 0]
 
 	if len(down_days_vol) < 2:
 		return None, "insufficient_data"
@@ -299,34 +303,25 @@ def _detect_distribution_clusters(dist_dates, cluster_window=CLUSTER_WINDOW, min
 			"cluster_warning": False,
 		}
 
-	from datetime import datetime, timedelta
-
-	parsed = sorted(datetime.strptime(d, "%Y-%m-%d") for d in dist_dates)
+	# Clusters are anchored at their first date and take every date within
+	# cluster_window days of it, so on the sorted days each cluster ends where a
+	# searchsorted on (anchor + window) lands — one jump per cluster, no per-date
+	# datetime parsing. ISO date strings sort chronologically as they are.
+	ordered = sorted(dist_dates)
+	days = np.array(ordered, dtype="datetime64[D]")
 	clusters = []
-	current_cluster = [parsed[0]]
-
-	for i in range(1, len(parsed)):
-		if (parsed[i] - current_cluster[0]).days <= cluster_window:
-			current_cluster.append(parsed[i])
-		else:
-			if len(current_cluster) >= min_cluster_size:
-				clusters.append(
-					{
-						"start": current_cluster[0].strftime("%Y-%m-%d"),
-						"end": current_cluster[-1].strftime("%Y-%m-%d"),
-						"count": len(current_cluster),
-					}
-				)
-			current_cluster = [parsed[i]]
-
-	if len(current_cluster) >= min_cluster_size:
-		clusters.append(
-			{
-				"start": current_cluster[0].strftime("%Y-%m-%d"),
-				"end": current_cluster[-1].strftime("%Y-%m-%d"),
-				"count": len(current_cluster),
-			}
-		)
+	start = 0
+	while start < len(days):
+		stop = int(np.searchsorted(days, days[start] + np.timedelta64(cluster_window, "D"), side="right"))
+		if stop - start >= min_cluster_size:
+			clusters.append(
+				{
+					"start": ordered[start],
+					"end": ordered[stop - 1],
+					"count": stop - start,
+				}
+			)
+		start = stop
 
 	max_size = max((c["count"] for c in clusters), default=0)
 	return {
@@ -342,38 +337,45 @@ def _detect_climactic_days(volumes, closes, vol_50avg, lookback=50):
 
 	Classifies direction and interpretation for institutional activity detection.
 	"""
-	recent_vol = volumes.tail(lookback)
+	recent_vol = volumes.tail(lookback).to_numpy(dtype=float)
 	recent_close = closes.tail(lookback)
+	close_arr = recent_close.to_numpy(dtype=float)
 	threshold = vol_50avg * CLIMACTIC_VOL_MULT
 
+	# Screen the whole window at once; only climactic bars are turned into records.
+	hits = np.flatnonzero(recent_vol[1:] >= threshold) + 1
+	price_chg = close_arr[hits] - close_arr[hits - 1]
+	prev_close = close_arr[hits - 1]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		pct_chg = np.where(prev_close != 0, price_chg / prev_close * 100, 0.0)
+	hit_dates = recent_close.index[hits].strftime("%Y-%m-%d")
+
 	climactic_days = []
 	buy_count = 0
 	sell_count = 0
 
-	for i in range(1, len(recent_vol)):
-		if recent_vol.iloc[i] >= threshold:
-			price_chg = float(recent_close.iloc[i] - recent_close.iloc[i - 1])
-			pct_chg = (price_chg / float(recent_close.iloc[i - 1])) * 100 if recent_close.iloc[i - 1] != 0 else 0
-			vol_multiple = round(float(recent_vol.iloc[i]) / vol_50avg, 1)
-
-			if price_chg > 0:
-				direction = "up"
-				interpretation = "institutional_buying"
-				buy_count += 1
-			else:
-				direction = "down"
-				interpretation = "institutional_selling" if abs(pct_chg) < 5 else "capitulation"
-				sell_count += 1
-
-			climactic_days.append(
-				{
-					"date": str(recent_close.index[i].date()),
-					"direction": direction,
-					"interpretation": interpretation,
-					"price_change_pct": round(pct_chg, 2),
-					"volume_multiple": vol_multiple,
-				}
-			)
+	for k, i in enumerate(hits.tolist()):
+		pct = float(pct_chg[k])
+		vol_multiple = round(float(recent_vol[i]) / vol_50avg, 1)
+
+		if price_chg[k] > 0:
+			direction = "up"
+			interpretation = "institutional_buying"
+			buy_count += 1
+		else:
+			direction = "down"
+			interpretation = "institutional_selling" if abs(pct) < 5 else "capitulation"
+			sell_count += 1
+
+		climactic_days.append(
+			{
+				"date": hit_dates[k],
+				"direction": direction,
+				"interpretation": interpretation,
+				"price_change_pct": round(pct, 2),
+				"volume_multiple": vol_multiple,
+			}
+		)
 
 	return {
 		"climactic_days": climactic_days,
@@ -383,7 +385,7 @@ def _detect_climactic_days(volumes, closes, vol_50avg, lookback=50):
 	}
 
 
-def _volume_direction_summary(volumes, closes, lookback=20):
+def _volume_direction_summary(volumes, closes, vol_50avg, lookback=20):
 	"""Summary statistics for recent volume direction (up vs down).
 
 	Lightweight summary without daily detail to avoid token waste.
@@ -391,20 +393,15 @@ def _volume_direction_summary(volumes, closes, lookback=20):
 	recent_vol = volumes.tail(lookback)
 	recent_close = closes.tail(lookback)
 	price_change = recent_close.diff()
-	vol_50avg = float(volumes.tail(50).mean()) if len(volumes) >= 50 else float(volumes.mean())
 
 	up_vol_total = float(recent_vol[price_change > 0].sum())
 	down_vol_total = float(recent_vol[price_change < 0].sum())
 	ratio = round(up_vol_total / down_vol_total, 3) if down_vol_total > 0 else 2.0
 
-	heavy_dist = 0
-	heavy_acc = 0
-	for i in range(1, len(recent_vol)):
-		if recent_vol.iloc[i] > vol_50avg:
-			if price_change.iloc[i] > 0:
-				heavy_acc += 1
-			elif price_change.iloc[i] < 0:
-				heavy_dist += 1
+	directions = _day_directions(recent_close)
+	heavy = recent_vol.to_numpy(dtype=float) > vol_50avg
+	heavy_acc = int(np.count_nonzero(heavy & (directions == 1)))
+	heavy_dist = int(np.count_nonzero(heavy & (directions == -1)))
 
 	return {
 		"up_volume_total": int(up_vol_total),
@@ -419,8 +416,7 @@ def _volume_direction_summary(volumes, closes, lookback=20):
 def cmd_analyze(args):
 	"""Full volume analysis with accumulation/distribution rating."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	# yfinance appends a partial in-session bar whose OHLC can be NaN; that NaN
 	# poisons closes.iloc[-1] and every comparison downstream. Drop it first.
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
@@ -448,8 +444,7 @@ def cmd_analyze(args):
 	ratio_50, up_vol_50, down_vol_50 = _calc_up_down_ratio(volumes, closes, args.lookback)
 
 	# Accumulation and distribution day counts
-	acc_days, acc_dates = _count_accumulation_days(volumes, closes, vol_50avg, args.lookback)
-	dist_days, dist_dates = _count_distribution_days(volumes, closes, vol_50avg, args.lookback)
+	acc_days, acc_dates, dist_days, dist_dates = _count_acc_dist_days(volumes, closes, vol_50avg, args.lookback)
 
 	# Up/down DAY-count ratio (the genuine second signal; the volume ratio is ratio_50)
 	count_ratio_50 = _calc_count_ratio(closes, args.lookback)
@@ -460,14 +455,9 @@ def cmd_analyze(args):
 
 	# Breakout volume confirmation
 	# Recent N days: any day with price up AND volume 25%+ above 50-day avg?
-	breakout_confirmed = False
-	recent_5_vol = volumes.tail(args.breakout_window)
-	recent_5_close = closes.tail(args.breakout_window)
-	recent_5_change = recent_5_close.diff()
-	for i in range(1, len(recent_5_vol)):
-		if recent_5_change.iloc[i] > 0 and recent_5_vol.iloc[i] > vol_50avg * BREAKOUT_VOL_MULT:
-			breakout_confirmed = True
-			break
+	recent_5_vol = volumes.tail(args.breakout_window).to_numpy(dtype=float)
+	recent_5_up = _day_directions(closes.tail(args.breakout_window)) == 1
+	breakout_confirmed = bool(np.any(recent_5_up & (recent_5_vol > vol_50avg * BREAKOUT_VOL_MULT)))
 
 	# Pullback volume analysis
 	pullback_declining, pullback_status = _check_pullback_volume(volumes, closes, args.pullback_window)
@@ -487,7 +477,7 @@ def cmd_analyze(args):
 	climactic = _detect_climactic_days(volumes, closes, vol_50avg, args.lookback)
 
 	# Volume direction summary (20-day)
-	vol_summary = _volume_direction_summary(volumes, closes, lookback=args.short_lookback)
+	vol_summary = _volume_direction_summary(volumes, closes, vol_50avg, lookback=args.short_lookback)
 
 	full_result = {
 		"symbol": symbol,
@@ -596,49 +586,57 @@ DEMAND_DAY_HIGH_CLOSE_RANGE = 0.7
 DEMAND_DAY_MODERATE_CLOSE_RANGE = 0.5
 
 
-def _close_range_pct(close, high, low):
-	"""Where the close sits in the day's range: 0.0 = at the low, 1.0 = at the high.
+def _close_range_pct(closes, highs, lows):
+	"""Where each close sits in its day's range: 0.0 = at the low, 1.0 = at the high.
 
 	A demand day that closes in the lower half of its range is buying that met
 	immediate supply — conviction unconfirmed. Closing high is the tell the bid
-	held into the close.
+	held into the close. A zero-range bar reads 0.5.
 	"""
-	rng = high - low
-	if rng <= 0:
-		return 0.5
-	return round((close - low) / rng, 2)
+	rng = highs - lows
+	with np.errstate(divide="ignore", invalid="ignore"):
+		return np.round(np.where(rng <= 0, 0.5, (closes - lows) / rng), 2)
 
 
-def _max_down_volume(closes, volumes, idx, lookback, min_decline_pct):
-	"""Largest volume among genuine down-days in the `lookback` sessions before idx.
+def _down_day_volumes(closes, volumes, min_decline_pct):
+	"""Volume of every genuine down-day, 0.0 on all other bars.
+
+	A trivial down-tick (< min_decline_pct below the prior close) is filtered as
+	noise, so it never sets the bar a demand day has to clear.
+	"""
+	decline_threshold = 1.0 - min_decline_pct / 100.0
+	down = np.zeros(len(closes), dtype=bool)
+	down[1:] = closes[1:] < closes[:-1] * decline_threshold
+	return np.where(down & (volumes > 0), volumes, 0.0)
+
+
+def _max_down_volume(down_vol, lookback):
+	"""Per bar, the largest down-day volume in the `lookback` sessions before it.
 
 	The bar a demand day must clear is the MAX prior down-day volume, not the
 	mean: one real institutional down-day is the supply genuine demand has to
-	overwhelm. A trivial down-tick (< min_decline_pct) is filtered as noise.
+	overwhelm. Every bar's window max comes out of one strided reduction.
 	"""
-	start = max(1, idx - lookback)
-	decline_threshold = 1.0 - min_decline_pct / 100.0
-	max_down_vol = 0.0
-	for i in range(start, idx):
-		if closes[i] < closes[i - 1] * decline_threshold and volumes[i] > max_down_vol:
-			max_down_vol = volumes[i]
-	return max_down_vol
+	n = len(down_vol)
+	if lookback <= 0:
+		return np.zeros(n)
+	padded = np.concatenate((np.zeros(lookback), down_vol))
+	return sliding_window_view(padded[:-1], lookback).max(axis=1)
 
 
-def _bigger_down_follows(closes, volumes, idx, demand_vol, lookahead, min_decline_pct):
-	"""True if a down-day with volume > demand_vol occurs within `lookahead` of idx.
+def _next_down_volume(down_vol, lookahead):
+	"""Per bar, the largest down-day volume in the `lookahead` sessions after it.
 
 	The disqualifier half of the rule: demand that is immediately overwhelmed by a
 	larger down-volume day was never accumulation. Reading only backward would
 	stamp 'demand' on a footprint the method explicitly voids, so we look forward
 	too. Near the right edge the lookahead is simply whatever bars exist.
 	"""
-	decline_threshold = 1.0 - min_decline_pct / 100.0
-	end = min(len(closes), idx + lookahead + 1)
-	for i in range(idx + 1, end):
-		if closes[i] < closes[i - 1] * decline_threshold and volumes[i] > demand_vol:
-			return True
-	return False
+	n = len(down_vol)
+	if lookahead <= 0:
+		return np.zeros(n)
+	padded = np.concatenate((down_vol, np.zeros(lookahead)))
+	return sliding_window_view(padded[1:], lookahead).max(axis=1)
 
 
 def _demand_location(pct_above_50ma, pct_above_10ma, in_base):
@@ -663,8 +661,7 @@ def _grade_demand_day(volume_ratio, close_range_pct, above_50ma):
 def cmd_demand_days(args):
 	"""Scan for institutional demand days inside the base."""
 	symbol = args.symbol.upper()
-	ticker = yf.Ticker(symbol)
-	data = ticker.history(period=args.period, interval="1d")
+	data = fetch_history(symbol, period=args.period, interval="1d")
 	data = data.dropna(subset=["Open", "High", "Low", "Close"])
 
 	if data.empty or len(data) < 60:
@@ -690,21 +687,26 @@ def cmd_demand_days(args):
 	stale_days = args.stale_days
 	scan_start = max(lookback + 1, n - args.scan_days)
 
+	# Screen every bar at once: an up-day whose volume clears the largest prior
+	# down-day volume and closes in the upper half of its range. Only the
+	# survivors reach the per-day grading below.
+	down_vol = _down_day_volumes(closes, volumes, min_decline)
+	prior_down_max = _max_down_volume(down_vol, lookback)
+	next_down_max = _next_down_volume(down_vol, lookback)
+	candidates = np.zeros(n, dtype=bool)
+	candidates[1:] = closes[1:] > closes[:-1]
+	candidates &= (prior_down_max > 0) & (volumes > prior_down_max)
+	close_range = _close_range_pct(closes, highs, lows)
+	candidates &= close_range >= 0.5
+	candidates[:scan_start] = False
+
 	demand_days = []
 	disqualified = 0
-	for i in range(scan_start, n):
-		# Must be an up-day.
-		if closes[i] <= closes[i - 1]:
-			continue
-		max_down_vol = _max_down_volume(closes, volumes, i, lookback, min_decline)
-		# Up-volume must dwarf the largest prior down-volume.
-		if max_down_vol <= 0 or volumes[i] <= max_down_vol:
-			continue
-		crp = _close_range_pct(closes[i], highs[i], lows[i])
-		if crp < 0.5:
-			continue
+	for i in np.flatnonzero(candidates).tolist():
+		max_down_vol = float(prior_down_max[i])
+		crp = float(close_range[i])
 		# Forward disqualifier: voided if an even-bigger down-volume day follows.
-		if _bigger_down_follows(closes, volumes, i, volumes[i], lookback, min_decline):
+		if next_down_max[i] > volumes[i]:
 			disqualified += 1
 			continue
 
@@ -82,9 +82,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-import numpy as np
-import yfinance as yf
-from utils import output_json, safe_run
+from utils import fetch_history, output_json, safe_run
 
 
 @safe_run
@@ -95,8 +93,7 @@ def cmd_bdi(args):
 	a reliable proxy for the Baltic Dry Index. BDI measures shipping costs
 	for dry bulk commodities and indicates global trade activity.
 	"""
-	ticker = yf.Ticker("BDRY")
-	data = ticker.history(period=args.period, interval=args.interval)
+	data = fetch_history("BDRY", period=args.period, interval=args.interval)
 
 	if data.empty:
 		output_json({"error": "No data available for BDRY"})
@@ -114,7 +111,7 @@ def cmd_bdi(args):
 	z_score = (current_value - mean_value) / std_value if std_value > 0 else 0
 
 	# Percentile ranking
-	percentile = float(np.percentile(prices, 100 * (prices < current_value).sum() / len(prices)))
+	percentile = float((prices < current_value).sum() / len(prices) * 100)
 
 	# Min/Max
 	min_value = float(prices.min())
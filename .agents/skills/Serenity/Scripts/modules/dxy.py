@@ -85,9 +85,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-import numpy as np
-import yfinance as yf
-from utils import output_json, safe_run
+from utils import fetch_history, output_json, safe_run
 
 
 @safe_run
@@ -98,8 +96,7 @@ def cmd_dxy(args):
 	positioning relative to historical mean. Z-score interpretation provides
 	dollar strength assessment for forex and commodity analysis.
 	"""
-	ticker = yf.Ticker("DX-Y.NYB")
-	data = ticker.history(period=args.period, interval=args.interval)
+	data = fetch_history("DX-Y.NYB", period=args.period, interval=args.interval)
 
 	if data.empty:
 		output_json({"error": "No data available for DXY"})
@@ -117,7 +114,7 @@ def cmd_dxy(args):
 	z_score = (current_value - mean_value) / std_value if std_value > 0 else 0
 
 	# Percentile ranking
-	percentile = float(np.percentile(prices, 100 * (prices < current_value).sum() / len(prices)))
+	percentile = float((prices < current_value).sum() / len(prices) * 100)
 
 	# Min/Max
 	min_value = float(prices.min())
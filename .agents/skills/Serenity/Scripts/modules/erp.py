@@ -292,19 +292,20 @@ def cmd_erp(args):
 	cape_df = cape_df[cape_df["Date"] >= start_date].copy()
 	cape_series = cape_df.set_index("Date")["CAPE"]
 
-	# Align dates: for each CAPE month, find closest US10Y
+	# Align dates: for each CAPE month, find closest US10Y. One nearest-match
+	# lookup covers every month instead of building a one-date Index per row.
+	us10y_positions = us10y_monthly.index.get_indexer(cape_series.index, method="nearest")
+	us10y_values = us10y_monthly.to_numpy(dtype=float)
 	erp_records = []
-	for date, cape_val in cape_series.items():
+	for (date, cape_val), us10y_pos in zip(cape_series.items(), us10y_positions.tolist()):
 		if pd.isna(cape_val) or cape_val <= 0:
 			continue
 
-		# Find closest US10Y date
 		date_ts = pd.Timestamp(date)
-		us10y_idx = us10y_monthly.index.get_indexer([date_ts], method="nearest")
-		if len(us10y_idx) == 0 or us10y_idx[0] < 0 or us10y_idx[0] >= len(us10y_monthly):
+		if us10y_pos < 0 or us10y_pos >= len(us10y_values):
 			continue
 
-		us10y_val = float(us10y_monthly.iloc[us10y_idx[0]])
+		us10y_val = float(us10y_values[us10y_pos])
 		if pd.isna(us10y_val):
 			continue
 
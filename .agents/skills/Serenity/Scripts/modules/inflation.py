@@ -122,8 +122,10 @@ def fetch_series(series_ids, start_date=None, end_date=None, limit=None):
 			if limit and len(data) > limit:
 				data = data.tail(limit)
 
-			# Convert to dict with date strings as keys
-			results[series_id] = {str(idx.date()): float(val) if val == val else None for idx, val in data.items()}
+			# Convert to dict with date strings as keys (one vectorized strftime over the index)
+			results[series_id] = dict(
+				zip(data.index.strftime("%Y-%m-%d"), (val if val == val else None for val in data.astype(float).tolist()))
+			)
 
 			# Get series info for metadata
 			info = fred.get_series_info(series_id)
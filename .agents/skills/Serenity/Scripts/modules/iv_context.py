@@ -82,9 +82,9 @@ import requests
 
 # Support both standalone execution and module imports
 try:
-	from ..utils import error_json, output_json, safe_run
+	from ..utils import error_json, fetch_history, output_json, safe_run
 except ImportError:
-	from utils import error_json, output_json, safe_run
+	from utils import error_json, fetch_history, output_json, safe_run
 
 
 # CBOE index symbols require underscore prefix
@@ -189,8 +189,7 @@ def _compute_realized_vol(symbol):
 	try:
 		import math
 		import statistics
-		import yfinance as yf
-		hist = yf.Ticker(symbol).history(period="3mo")
+		hist = fetch_history(symbol, period="3mo")
 		closes = [float(c) for c in hist["Close"].dropna().tolist()]
 		if len(closes) < 21:
 			return {}
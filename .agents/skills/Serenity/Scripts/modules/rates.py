@@ -123,8 +123,10 @@ def fetch_series(series_ids, start_date=None, end_date=None, limit=None):
 			if limit and len(data) > limit:
 				data = data.tail(limit)
 
-			# Convert to dict with date strings as keys
-			results[series_id] = {str(idx.date()): float(val) if val == val else None for idx, val in data.items()}
+			# Convert to dict with date strings as keys (one vectorized strftime over the index)
+			results[series_id] = dict(
+				zip(data.index.strftime("%Y-%m-%d"), (val if val == val else None for val in data.astype(float).tolist()))
+			)
 
 			# Get series info for metadata
 			info = fred.get_series_info(series_id)
@@ -293,8 +295,6 @@ def cmd_international_yield(args):
 @safe_run
 def cmd_yield_spread(args):
 	"""Calculate yield spread between two countries/maturities."""
-	import numpy as np
-
 	fred = get_fred_client()
 
 	# Map country-maturity combinations to FRED series
@@ -342,7 +342,7 @@ def cmd_yield_spread(args):
 	z_score = (current_spread - mean_spread) / std_spread if std_spread > 0 else 0
 
 	# Percentile ranking
-	percentile = float(np.percentile(spread, 100 * (spread < current_spread).sum() / len(spread)))
+	percentile = float((spread < current_spread).sum() / len(spread) * 100)
 
 	result = {
 		"date": str(spread.index[-1].date()),
@@ -3,10 +3,29 @@
 import datetime
 import functools
 import json
+import math
+import os
 import sys
+import time
 
 import pandas as pd
 
+try:
+	import orjson
+except ImportError:  # optional: output falls back to the stdlib encoder
+	orjson = None
+
+# --- price-history disk cache ---
+# Macro gauges (dxy, bdi) and the IV context re-pull the same OHLCV from Yahoo
+# every time an analysis is re-run. Persisting each (symbol, period, interval)
+# response for a short window turns those repeats into a local read. Lives beside
+# the Shiller CAPE cache in Scripts/.cache.
+HISTORY_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "history")
+# Session-level bars barely move within an hour; intraday bars go stale in minutes.
+HISTORY_CACHE_TTL_SECONDS = 60 * 60
+HISTORY_CACHE_INTRADAY_TTL_SECONDS = 5 * 60
+_INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
 
 def normalize(obj):
 	"""Convert pandas/numpy types to JSON-serializable Python objects."""
@@ -15,7 +34,7 @@ def normalize(obj):
 	if isinstance(obj, bool):
 		return obj
 	if isinstance(obj, float):
-		if obj != obj:  # NaN check
+		if not math.isfinite(obj):  # NaN/inf have no JSON form
 			return None
 		return obj
 	if isinstance(obj, (str, int)):
@@ -41,22 +60,39 @@ def normalize(obj):
 		return [normalize(v) for v in obj]
 	if hasattr(obj, "item"):  # numpy scalar
 		val = obj.item()
-		if isinstance(val, float) and val != val:
+		if isinstance(val, float) and not math.isfinite(val):
 			return None
 		return val
 	return str(obj)
 
 
+def _dump_json(obj):
+	"""Write already-normalized obj to stdout as 2-space-indented UTF-8 JSON.
+
+	orjson encodes in Rust several times faster than json.dump, which matters for
+	the large pipeline payloads. Anything it refuses (e.g. ints beyond 64 bits)
+	drops to the stdlib encoder. normalize() has already turned NaN/inf into None,
+	so both encoders emit the same null for them.
+	"""
+	if orjson is not None:
+		try:
+			sys.stdout.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+			print()
+			return
+		except TypeError:
+			pass
+	json.dump(obj, sys.stdout, ensure_ascii=False, indent=2)
+	print()
+
+
 def output_json(data):
 	"""Serialize data to JSON and print to stdout."""
-	json.dump(normalize(data), sys.stdout, ensure_ascii=False, indent=2)
-	print()
+	_dump_json(normalize(data))
 
 
 def error_json(message, code=1):
 	"""Output error as JSON and exit."""
-	json.dump({"error": str(message)}, sys.stdout, ensure_ascii=False, indent=2)
-	print()
+	_dump_json({"error": str(message)})
 	sys.exit(code)
 
 
@@ -69,15 +105,61 @@ def output_json_records(data):
 	"""
 	if isinstance(data, pd.DataFrame):
 		if data.empty:
-			json.dump([], sys.stdout, ensure_ascii=False, indent=2)
+			_dump_json([])
 		else:
 			records = [{str(col): normalize(row[col]) for col in data.columns} for _, row in data.iterrows()]
-			json.dump(records, sys.stdout, ensure_ascii=False, indent=2)
-		print()
+			_dump_json(records)
 	else:
 		output_json(data)
 
 
+def _history_cache_path(symbol, period, interval):
+	key = f"{symbol.upper()}_{period}_{interval}".replace(os.sep, "_")
+	return os.path.join(HISTORY_CACHE_DIR, key + ".pkl")
+
+
+def _read_cached_history(symbol, period, interval):
+	"""The cached frame if it is still within its TTL, else None."""
+	path = _history_cache_path(symbol, period, interval)
+	ttl = HISTORY_CACHE_INTRADAY_TTL_SECONDS if interval in _INTRADAY_INTERVALS else HISTORY_CACHE_TTL_SECONDS
+	try:
+		if time.time() - os.path.getmtime(path) < ttl:
+			return pd.read_pickle(path)
+	except Exception:
+		pass
+	return None
+
+
+def _write_cached_history(symbol, period, interval, data):
+	if data.empty:
+		return
+	path = _history_cache_path(symbol, period, interval)
+	try:
+		os.makedirs(HISTORY_CACHE_DIR, exist_ok=True)
+		tmp = f"{path}.{os.getpid()}.tmp"
+		data.to_pickle(tmp)
+		os.replace(tmp, path)  # atomic: concurrent runs never read a half-written file
+	except OSError:
+		pass
+
+
+def fetch_history(symbol, period="1y", interval="1d"):
+	"""`yf.Ticker(symbol).history(period=..., interval=...)` behind a short-TTL disk cache.
+
+	A fresh file is served without touching the network; a stale, missing or
+	unreadable one falls through to Yahoo and is rewritten. Cache I/O failures
+	never fail the caller — at worst the fetch simply isn't cached. Empty frames
+	are not cached, so a transient Yahoo miss is retried on the next call.
+	"""
+	data = _read_cached_history(symbol, period, interval)
+	if data is None:
+		import yfinance as yf
+
+		data = yf.Ticker(symbol).history(period=period, interval=interval)
+		_write_cached_history(symbol, period, interval, data)
+	return data
+
+
 def safe_run(func):
 	"""Decorator: wrap function in try/except with JSON error output."""
 